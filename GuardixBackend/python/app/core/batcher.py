@@ -0,0 +1,101 @@
+"""Micro-batching for model inference: coalesce concurrent requests into one vectorized call."""
+import asyncio
+from typing import Any, Callable, List, Optional, Sequence
+
+
+class MicroBatcher:
+    """Queues single items and runs `fn` over up to `max_batch` of them at once in the default executor.
+
+    The worker drains whatever is already queued, then waits at most `window` seconds for more before
+    dispatching. It is started lazily on the first `submit`, so it always lives on the serving loop;
+    `close` stops it at shutdown.
+    """
+
+    def __init__(self, fn: Callable[[List[Any]], Sequence[Any]], max_batch: int = 64, window: float = 0.005) -> None:
+        self.fn = fn
+        self.max_batch = max_batch
+        self.window = window
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        task = self._task
+        if task is None or task.done() or task.get_loop() is not loop:
+            if task is None or task.get_loop() is not loop:
+                if self._queue is not None:
+                    _cancel_queued(self._queue)
+                self._queue = asyncio.Queue()
+            # A worker that died on this loop hands its queue, and what is still in it, to the new one
+            self._task = loop.create_task(self._worker())
+        return self._queue
+
+    async def close(self) -> None:
+        """Stop the worker; requests still queued or mid-batch are cancelled."""
+        task, queue = self._task, self._queue
+        self._task = self._queue = None
+        if task is not None:
+            task.cancel()
+            if task.get_loop() is asyncio.get_running_loop():
+                await asyncio.gather(task, return_exceptions=True)
+        if queue is not None:
+            _cancel_queued(queue)
+
+    async def submit(self, item: Any) -> Any:
+        queue = self._ensure_worker()
+        fut = asyncio.get_running_loop().create_future()
+        await queue.put((item, fut))
+        return await fut
+
+    async def _collect(self, queue: asyncio.Queue, batch: list) -> None:
+        # Fills the caller's list, so items taken before a cancellation are still seen by the worker
+        batch.append(await queue.get())
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.window
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+    async def _worker(self) -> None:
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        while True:
+            batch: list = []
+            try:
+                await self._collect(queue, batch)
+                results = await loop.run_in_executor(None, self.fn, [item for item, _ in batch])
+            except asyncio.CancelledError:
+                for _, fut in batch:
+                    fut.cancel()
+                raise
+            except Exception as exc:
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(exc)
+                continue
+            for (_, fut), result in zip(batch, results):
+                if not fut.done():
+                    fut.set_result(result)
+
+
+def _cancel_queued(queue: asyncio.Queue) -> None:
+    """Cancel the futures of requests left in a worker's queue."""
+    while True:
+        try:
+            _, fut = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        try:
+            fut.get_loop().call_soon_threadsafe(fut.cancel)
+        except RuntimeError:
+            pass  # its loop is closed, so nothing is waiting on it
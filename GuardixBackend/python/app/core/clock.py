@@ -0,0 +1,30 @@
+"""Coarse wall clock refreshed by a background task, for response timestamps."""
+import asyncio
+import time
+from datetime import datetime
+
+
+def epoch_ms() -> int:
+    """Current time as integer milliseconds since the Unix epoch (the wire format for timestamps)."""
+    return time.time_ns() // 1_000_000
+
+
+class CachedClock:
+    """Holds the current UTC time, refreshed every `interval` seconds instead of read per request."""
+
+    def __init__(self, interval: float = 0.5) -> None:
+        self.interval = interval
+        self.tick()
+
+    def tick(self) -> None:
+        self.now = datetime.utcnow()
+        self.now_iso = self.now.isoformat()
+        self.now_ms = epoch_ms()
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self.tick()
+
+
+clock = CachedClock()
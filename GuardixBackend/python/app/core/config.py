@@ -12,16 +12,37 @@ class Settings(BaseModel):
     jwt_secret: str = os.getenv("JWT_SECRET", "dev_secret_change_me")
     jwt_algorithm: str = os.getenv("JWT_ALG", "HS256")
     access_token_exp_minutes: int = int(os.getenv("JWT_EXP_MIN", "60"))
+    token_cache_size: int = int(os.getenv("JWT_CACHE_SIZE", "10000"))
+    token_cache_ttl_seconds: float = float(os.getenv("JWT_CACHE_TTL", "30"))
+    token_reuse_threshold_seconds: float = float(os.getenv("JWT_REUSE_THRESHOLD", "60"))
+    issued_token_cache_size: int = int(os.getenv("JWT_ISSUED_CACHE_SIZE", "10000"))
 
     # Database (MongoDB optional)
     mongo_enabled: bool = os.getenv("MONGO_ENABLED", "false").lower() == "true"
     mongo_uri: str = os.getenv("MONGO_URI", "mongodb://localhost:27017")
     mongo_db: str = os.getenv("MONGO_DB", "guardix")
 
+    # Mock endpoints sleep to mimic device work; disable for benchmarking
+    simulate_latency: bool = os.getenv("SIMULATE_LATENCY", "true").lower() == "true"
+
+    # Route modules mounted by app.main (GUARDIX_ROUTES=auth,scan,...); storage/utilities have no routes yet
+    enabled_routes: list[str] = [
+        name.strip()
+        for name in os.getenv(
+            "GUARDIX_ROUTES",
+            "auth,scan,biometric,ids,federated,models,performance,network,security,anomaly,realtime",
+        ).split(",")
+        if name.strip()
+    ]
+
+    # In-memory store
+    log_buffer_size: int = int(os.getenv("LOG_BUF", "100000"))
+
     # Paths
     base_dir: str = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
     models_dir: str = os.path.join(base_dir, "models_store")
     data_dir: str = os.path.join(base_dir, "data")
+    memory_snapshot_path: str = os.getenv("MEMORY_SNAPSHOT", os.path.join(data_dir, "memory_snapshot.pkl"))
 
     def resolve_profile(self, profile: str | None = None) -> str:
         value = (profile or self.model_profile or "lite").lower()
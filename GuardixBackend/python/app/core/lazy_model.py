@@ -0,0 +1,49 @@
+"""Lazy model loading and background warm-up for the ML services."""
+import asyncio
+import logging
+import threading
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class LazyModel:
+    """Base for services whose estimator is loaded (or trained) on first use.
+
+    Subclasses implement `_ensure_model`, which sets `self._model`; it runs at most once, under a lock.
+    """
+
+    def __init__(self) -> None:
+        self._model = None
+        self._model_lock = threading.Lock()
+
+    @property
+    def model(self) -> Any:
+        # Loaded on first use so unused models don't slow startup or sit on the heap
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    self._ensure_model()
+        return self._model
+
+    def _ensure_model(self) -> None:
+        raise NotImplementedError
+
+
+def _warm_up(call: Callable[[], Any]) -> None:
+    try:
+        call()
+    except Exception:
+        # e.g. an unloadable model file; the first request will hit the same error
+        logger.exception("Model warm-up failed: %s", getattr(call, "__qualname__", call))
+
+
+def start_warm_up(*calls: Callable[[], Any]) -> None:
+    """Run throwaway predictions in the default executor from a startup hook.
+
+    Startup isn't held up, and the first request doesn't pay for loading models or sklearn/scipy's
+    lazy imports. Failures are logged.
+    """
+    loop = asyncio.get_running_loop()
+    for call in calls:
+        loop.run_in_executor(None, _warm_up, call)
@@ -0,0 +1,49 @@
+"""Pre-drawn uniform samples for the simulated (mock) endpoints."""
+import threading
+from typing import Sequence, TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+
+
+class RandomPool:
+    """Uniform [0, 1) samples drawn in large blocks and handed out by a rotating offset."""
+
+    def __init__(self, size: int = 1 << 16, seed: int | None = None) -> None:
+        self._rng = np.random.default_rng(seed)
+        self._size = size
+        self._pool = self._rng.random(size)
+        self._offset = 0
+        self._lock = threading.Lock()
+
+    def take(self, n: int) -> np.ndarray:
+        with self._lock:
+            if self._offset + n > self._size:
+                # Replace rather than refill in place so views already handed out stay valid
+                self._pool = self._rng.random(self._size)
+                self._offset = 0
+            start = self._offset
+            self._offset += n
+            return self._pool[start:start + n]
+
+    def sample(self, population: np.ndarray, k: int) -> np.ndarray:
+        """`k` distinct items of `population` (random.sample equivalent)."""
+        keys = self.take(len(population))
+        return population[np.argpartition(keys, k)[:k]]
+
+
+def uniform(u: float, low: float, high: float) -> float:
+    return float(low + (high - low) * u)
+
+
+def randint(u: float, low: int, high: int) -> int:
+    """Integer in [low, high], inclusive like random.randint."""
+    return low + int(u * (high - low + 1))
+
+
+def pick(u: float, options: Sequence[T]) -> T:
+    return options[int(u * len(options))]
+
+
+random_pool = RandomPool()
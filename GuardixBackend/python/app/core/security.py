@@ -1,41 +1,173 @@
-from datetime import datetime, timedelta
-from typing import Optional
+import base64
+import hashlib
+import hmac
+import threading
+import time
+from datetime import timedelta
+from typing import Dict, Final, Optional, Tuple
 
 import jwt
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
+import orjson
+from fastapi import Depends, Header, HTTPException, status
 
 from app.core.config import settings
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
+# Built once: key bytes, algorithm list and decoder options are the same for every request
+_JWT_KEY: Final = settings.jwt_secret.encode()
+_JWT_ALGORITHMS: Final = [settings.jwt_algorithm]
+_TOKEN_LIFETIME: Final = timedelta(minutes=settings.access_token_exp_minutes)
+_TOKEN_CACHE_SIZE: Final = settings.token_cache_size
+_TOKEN_CACHE_TTL: Final = settings.token_cache_ttl_seconds
+_TOKEN_REUSE_THRESHOLD: Final = settings.token_reuse_threshold_seconds
+_ISSUED_TOKENS_SIZE: Final = settings.issued_token_cache_size
+_jwt = jwt.PyJWT(options={"require": ["exp"], "verify_exp": True})
 
-def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+# HMAC state keyed once at import; each verification copies it instead of re-deriving the pads
+_HMAC_DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+_hmac_template = (
+    hmac.new(_JWT_KEY, digestmod=_HMAC_DIGESTS[settings.jwt_algorithm])
+    if settings.jwt_algorithm in _HMAC_DIGESTS
+    else None
+)
+
+
+def _b64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _verify_hmac_token(token: str) -> dict:
+    """Verify an HS* JWT against the pre-keyed HMAC template; raises the matching PyJWT errors."""
+    try:
+        signing_input, _, signature = token.rpartition(".")
+        header_segment, _, payload_segment = signing_input.partition(".")
+        header = orjson.loads(_b64url_decode(header_segment))
+        payload = orjson.loads(_b64url_decode(payload_segment))
+        signature = _b64url_decode(signature)
+    except (ValueError, orjson.JSONDecodeError) as exc:
+        raise jwt.DecodeError("Invalid token encoding") from exc
+    if not isinstance(header, dict) or header.get("alg") != _JWT_ALGORITHMS[0] or not isinstance(payload, dict):
+        raise jwt.InvalidAlgorithmError("The specified alg value is not allowed")
+
+    mac = _hmac_template.copy()
+    mac.update(signing_input.encode())
+    if not hmac.compare_digest(mac.digest(), signature):
+        raise jwt.InvalidSignatureError("Signature verification failed")
+
+    if "exp" not in payload:
+        raise jwt.MissingRequiredClaimError("exp")
+    try:
+        exp = int(payload["exp"])
+    except (TypeError, ValueError) as exc:
+        raise jwt.DecodeError("Expiration Time claim (exp) must be an integer.") from exc
+    now = time.time()
+    if exp <= now:
+        raise jwt.ExpiredSignatureError("Signature has expired")
+    for claim, name in (("nbf", "Not Before"), ("iat", "Issued At")):
+        if claim not in payload:
+            continue
+        try:
+            issued = int(payload[claim])
+        except (TypeError, ValueError) as exc:
+            raise jwt.DecodeError(f"{name} claim ({claim}) must be an integer.") from exc
+        if issued > now:
+            raise jwt.ImmatureSignatureError("The token is not yet valid")
+    return payload
+
+
+# Verified token payloads keyed by a digest of the raw token: digest -> (payload, expires_at)
+_token_cache: Dict[bytes, Tuple[dict, float]] = {}
+_token_cache_lock = threading.Lock()
+
+
+def _token_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _sweep_cache(cache: Dict, max_size: int, now: float) -> None:
+    """Drop entries expiring by `now`, then the oldest ones while the cache is still full.
+    Entries are (value, expires_at); caller holds the cache's lock."""
+    for key in [k for k, (_, expires_at) in cache.items() if expires_at <= now]:
+        del cache[key]
+    while len(cache) >= max_size:
+        del cache[next(iter(cache))]
+
+
+def _decode_token(token: str) -> dict:
+    """Decode and verify a JWT, reusing a recent verification until the token's own expiry."""
+    key = _token_key(token)
+    now = time.time()
+    with _token_cache_lock:
+        cached = _token_cache.get(key)
+    # Each caller gets its own copy, so a handler mutating current_user can't leak into later requests
+    if cached is not None and cached[1] > now:
+        return dict(cached[0])
+
+    if _hmac_template is not None:
+        payload = _verify_hmac_token(token)
+    else:
+        payload = _jwt.decode(token, _JWT_KEY, algorithms=_JWT_ALGORITHMS)
+    expires_at = now + _TOKEN_CACHE_TTL
+    if "exp" in payload:
+        expires_at = min(expires_at, float(payload["exp"]))
+    with _token_cache_lock:
+        if key not in _token_cache and len(_token_cache) >= _TOKEN_CACHE_SIZE:
+            _sweep_cache(_token_cache, _TOKEN_CACHE_SIZE, now)
+        _token_cache[key] = (payload, expires_at)
+    return dict(payload)
+
+
+# Tokens issued per subject, reused until close to expiry: sub -> (token, expires_at). Subjects
+# come from unauthenticated logins, so the map is capped at _ISSUED_TOKENS_SIZE
+_issued_tokens: Dict[str, Tuple[str, float]] = {}
+_issued_tokens_lock = threading.Lock()
+
+
+def create_access_token(subject: str, expires_delta: Optional[timedelta] = None) -> str:
+    """Issue a JWT for `subject`, reusing a still-fresh token minted with the default lifetime."""
+    now = time.time()
+    if expires_delta is None:
+        with _issued_tokens_lock:
+            issued = _issued_tokens.get(subject)
+        if issued is not None and issued[1] - now > _TOKEN_REUSE_THRESHOLD:
+            return issued[0]
+        lifetime = _TOKEN_LIFETIME
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
+        lifetime = expires_delta
+    expires_at = now + lifetime.total_seconds()
+    encoded_jwt = _jwt.encode({"sub": subject, "exp": int(expires_at)}, _JWT_KEY, algorithm=_JWT_ALGORITHMS[0])
+    if expires_delta is None:
+        with _issued_tokens_lock:
+            if subject not in _issued_tokens and len(_issued_tokens) >= _ISSUED_TOKENS_SIZE:
+                # Entries within the reuse threshold of expiry are never handed out again
+                _sweep_cache(_issued_tokens, _ISSUED_TOKENS_SIZE, now + _TOKEN_REUSE_THRESHOLD)
+            _issued_tokens[subject] = (encoded_jwt, expires_at)
     return encoded_jwt
 
-async def get_current_user(token: str = Depends(oauth2_scheme)):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+
+_credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+
+async def bearer_token(authorization: Optional[str] = Header(None)) -> str:
+    """Extract the token from an `Authorization: Bearer <token>` header."""
+    if not authorization or not authorization.startswith("Bearer "):
+        raise _credentials_exception
+    return authorization[7:]
+
+
+async def get_current_user(token: str = Depends(bearer_token)):
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-        return payload
+        return _decode_token(token)
     except jwt.PyJWTError:
-        raise credentials_exception
+        raise _credentials_exception
+
 
 async def get_current_user_ws(token: str):
     """Authenticate WebSocket connections using JWT token"""
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-        return payload
+        return _decode_token(token)
     except jwt.PyJWTError:
         return None
-
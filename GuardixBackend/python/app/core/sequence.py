@@ -0,0 +1,15 @@
+"""Process-local identifiers for scans and sessions (not security tokens)."""
+import itertools
+import secrets
+
+
+class IdSequence:
+    """`<prefix>_<8 random hex chars fixed per process><8-hex counter>`: unique per process, no syscall per id."""
+
+    def __init__(self, prefix: str) -> None:
+        self._prefix = f"{prefix}_{secrets.token_hex(4)}"
+        # next() on itertools.count is atomic under the GIL
+        self._counter = itertools.count()
+
+    def next(self) -> str:
+        return f"{self._prefix}{next(self._counter):08x}"
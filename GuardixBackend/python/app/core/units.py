@@ -0,0 +1,4 @@
+"""Byte sizes for the simulated (mock) endpoints."""
+
+MB = 1024 * 1024
+GB = 1024 * MB
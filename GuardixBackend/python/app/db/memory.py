@@ -1,15 +1,63 @@
 """Simple in-memory storage as a fallback when no DB is configured."""
-from datetime import datetime
-from typing import Any, Dict, List
-from uuid import uuid4
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_UUID_BATCH = 1024
+_rand_buf = b""
+_rand_off = 0
+_rand_lock = threading.Lock()
+
+
+def _fast_uuid_hex() -> str:
+    """Equivalent of `uuid4().hex`, drawing randomness from a pooled `os.urandom` batch."""
+    global _rand_buf, _rand_off
+    with _rand_lock:
+        if _rand_off + 16 > len(_rand_buf):
+            _rand_buf = os.urandom(16 * _UUID_BATCH)
+            _rand_off = 0
+        raw = _rand_buf[_rand_off:_rand_off + 16]
+        _rand_off += 16
+    # version=4 sets the RFC 4122 version and variant bits
+    return UUID(bytes=raw, version=4).hex
+
+
+def _iso(ts_ns: int) -> str:
+    """Format a stored `time.time_ns()` stamp as an ISO-8601 UTC string."""
+    return datetime.fromtimestamp(ts_ns / 1e9, tz=timezone.utc).isoformat()
+
+
+def _serialize(entries: Deque[Dict[str, Any]], limit: Optional[int]) -> List[Dict[str, Any]]:
+    """Format the newest `limit` entries (all when None), oldest first."""
+    start = 0 if limit is None else max(len(entries) - limit, 0)
+    return [{**e, "ts": _iso(e["ts"])} for e in islice(entries, start, None)]
 
 
 class MemoryStore:
     def __init__(self) -> None:
         self.users: Dict[str, Dict[str, Any]] = {}
-        self.logs: List[Dict[str, Any]] = []
-        self.alerts: List[Dict[str, Any]] = []
-        self.biometric_profiles: Dict[str, Dict[str, Any]] = {}
+        # Ring buffers: appends stay O(1) and the oldest entries are evicted once full
+        self.logs: Deque[Dict[str, Any]] = deque(maxlen=settings.log_buffer_size)
+        self.alerts: Deque[Dict[str, Any]] = deque(maxlen=settings.log_buffer_size)
+        # Biometric templates as struct-of-arrays: user_id -> row of a contiguous float32 matrix
+        self.user_index: Dict[str, int] = {}
+        self.bio_feats: np.ndarray = np.empty((0, 0), dtype=np.float32)
+        # Verification runs in worker threads; enrolment must not race on row allocation
+        self._bio_lock = threading.Lock()
 
     # Users
     def upsert_user(self, user_id: str, data: Dict[str, Any]) -> None:
@@ -20,23 +68,91 @@ class MemoryStore:
 
     # Logs
     def add_log(self, entry: Dict[str, Any]) -> str:
-        entry = {**entry, "_id": str(uuid4()), "ts": datetime.utcnow().isoformat()}
+        entry = {**entry, "_id": _fast_uuid_hex(), "ts": time.time_ns()}
         self.logs.append(entry)
         return entry["_id"]
 
+    def list_logs(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        return _serialize(self.logs, limit)
+
     # Alerts
     def add_alert(self, entry: Dict[str, Any]) -> str:
-        entry = {**entry, "_id": str(uuid4()), "ts": datetime.utcnow().isoformat()}
+        entry = {**entry, "_id": _fast_uuid_hex(), "ts": time.time_ns()}
         self.alerts.append(entry)
         return entry["_id"]
 
+    def list_alerts(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        return _serialize(self.alerts, limit)
+
     # Biometric Profiles
-    def set_biometric_profile(self, user_id: str, profile: Dict[str, Any]) -> None:
-        self.biometric_profiles[user_id] = profile
+    def _reserve_bio_rows(self, rows: int, dim: int) -> None:
+        capacity, current_dim = self.bio_feats.shape
+        if current_dim and current_dim != dim:
+            raise ValueError(f"Biometric template has {dim} features, expected {current_dim}")
+        if rows <= capacity:
+            return
+        grown = np.zeros((max(rows, capacity * 2, 16), dim), dtype=np.float32)
+        if capacity:
+            grown[:capacity] = self.bio_feats
+        self.bio_feats = grown
 
-    def get_biometric_profile(self, user_id: str) -> Dict[str, Any]:
-        return self.biometric_profiles.get(user_id)
+    def set_biometric_profile(self, user_id: str, template: np.ndarray) -> None:
+        vec = np.asarray(template, dtype=np.float32).ravel()
+        with self._bio_lock:
+            row = self.user_index.get(user_id)
+            if row is None:
+                row = len(self.user_index)
+                self._reserve_bio_rows(row + 1, vec.size)
+                self.user_index[user_id] = row
+            self.bio_feats[row] = vec
 
+    def get_biometric_profile(self, user_id: str) -> Optional[np.ndarray]:
+        row = self.user_index.get(user_id)
+        return None if row is None else self.bio_feats[row]
 
-memdb = MemoryStore()
+    def biometric_matrix(self) -> Tuple[List[str], np.ndarray]:
+        """All enrolled user ids and their templates, row-aligned, for batch similarity."""
+        return list(self.user_index), self.bio_feats[: len(self.user_index)]
 
+    # Persistence: one checkpoint at shutdown, restored at startup; never per-operation I/O
+    def snapshot(self, path: str) -> None:
+        with self._bio_lock:
+            state = {
+                "users": self.users,
+                "logs": list(self.logs),
+                "alerts": list(self.alerts),
+                "user_index": dict(self.user_index),
+                "bio_feats": self.bio_feats[: len(self.user_index)].copy(),
+            }
+        # Own temp file per call: with several workers, each one snapshots at shutdown
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                pickle.dump(state, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def restore(self, path: str) -> bool:
+        if not os.path.exists(path):
+            return False
+        try:
+            with open(path, "rb") as fh:
+                state = pickle.load(fh)
+            users, logs, alerts = state["users"], state["logs"], state["alerts"]
+            user_index, bio_feats = state["user_index"], state["bio_feats"]
+        except Exception as e:
+            # Only a cache of the last run; start empty rather than fail startup
+            logger.warning(f"Ignoring unreadable memory snapshot {path}: {e!r}")
+            return False
+        self.users = users
+        self.logs.extend(logs)
+        self.alerts.extend(alerts)
+        with self._bio_lock:
+            self.user_index = user_index
+            self.bio_feats = bio_feats
+        return True
+
+
+memdb = MemoryStore()
@@ -1,24 +1,17 @@
+import asyncio
+import importlib
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
+from app.core.clock import clock
 from app.core.config import settings
+from app.db.memory import memdb
 from app.models.schemas import HealthResponse
-from app.routes import auth as auth_routes
-from app.routes import scan as scan_routes
-from app.routes import biometric as biometric_routes
-from app.routes import ids as ids_routes
-from app.routes import federated as federated_routes
-from app.routes import models as models_routes
-from app.routes import storage as storage_routes
-from app.routes import utilities as utilities_routes
-from app.routes import performance as performance_routes
-from app.routes import network as network_routes
-from app.routes import security as security_routes
-from app.routes import anomaly as anomaly_routes
-from app.routes import realtime as realtime_routes
-
-
-app = FastAPI(title=settings.app_name, description="Backend API for Guardix Mobile Security Application", version=settings.version)
+
+
+app = FastAPI(title=settings.app_name, description="Backend API for Guardix Mobile Security Application", version=settings.version, default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -29,27 +22,51 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+async def start_clock():
+    app.state.clock_task = asyncio.create_task(clock.run())
+
+
+@app.on_event("startup")
+async def restore_memory_store():
+    if not settings.mongo_enabled:
+        memdb.restore(settings.memory_snapshot_path)
+
+
+@app.on_event("shutdown")
+async def stop_clock():
+    app.state.clock_task.cancel()
+
+
+@app.on_event("shutdown")
+async def snapshot_memory_store():
+    if not settings.mongo_enabled:
+        memdb.snapshot(settings.memory_snapshot_path)
+
+
 @app.get("/", response_model=HealthResponse)
 async def root():
     return HealthResponse(message="Guardix Security API is running", version=settings.version, status="healthy")
 
 
-# Routers
-app.include_router(auth_routes.router)
-app.include_router(scan_routes.router)
-app.include_router(biometric_routes.router)
-app.include_router(ids_routes.router)
-app.include_router(federated_routes.router)
-app.include_router(models_routes.router)
-app.include_router(storage_routes.router)
-app.include_router(utilities_routes.router)
-app.include_router(performance_routes.router)
-app.include_router(network_routes.router)
-app.include_router(security_routes.router)
-app.include_router(anomaly_routes.router)
-app.include_router(realtime_routes.router)
+# Routers: only the enabled feature modules (and the services they pull in) are imported
+for route_name in settings.enabled_routes:
+    app.include_router(importlib.import_module(f"app.routes.{route_name}").router)
 
 
 if __name__ == "__main__":
+    import os
+    import sys
+
     import uvicorn
-    uvicorn.run(app, host="127.0.0.1", port=8000, reload=True)
+
+    # uvloop/httptools ship with uvicorn[standard]; uvloop has no Windows build
+    uvicorn.run(
+        "app.main:app",
+        host="127.0.0.1",
+        port=8000,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        reload=settings.environment == "dev",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+    )
@@ -1,7 +1,17 @@
-from datetime import datetime
 from typing import List, Optional, Dict, Any
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl
+
+from app.core.clock import epoch_ms
+
+# Items per batch scan request; each batch runs as one predict call
+MAX_BATCH_ITEMS = 256
+
+
+class StrictRequest(BaseModel):
+    """Base for hot request bodies: unknown fields are rejected instead of collected."""
+
+    model_config = ConfigDict(extra="forbid")
 
 
 class HealthResponse(BaseModel):
@@ -30,7 +40,7 @@ class ScanClassification(BaseModel):
 class APKScanResponse(BaseModel):
     scan_id: str
     classification: ScanClassification
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: int = Field(default_factory=epoch_ms)  # epoch milliseconds
 
 
 class PhishingScanRequest(BaseModel):
@@ -42,7 +52,23 @@ class PhishingScanResponse(BaseModel):
     scan_id: str
     probability: float
     is_phishing: bool
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: int = Field(default_factory=epoch_ms)  # epoch milliseconds
+
+
+class APKBatchScanRequest(BaseModel):
+    items: List[APKScanRequest] = Field(max_length=MAX_BATCH_ITEMS)
+
+
+class APKBatchScanResponse(BaseModel):
+    results: List[APKScanResponse]
+
+
+class PhishingBatchScanRequest(BaseModel):
+    items: List[PhishingScanRequest] = Field(max_length=MAX_BATCH_ITEMS)
+
+
+class PhishingBatchScanResponse(BaseModel):
+    results: List[PhishingScanResponse]
 
 
 class BiometricSample(BaseModel):
@@ -61,7 +87,7 @@ class BiometricAuthResponse(BaseModel):
     match: bool
     probability: float
     threshold: float
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: int = Field(default_factory=epoch_ms)  # epoch milliseconds
 
 
 class IDSLog(BaseModel):
@@ -70,26 +96,32 @@ class IDSLog(BaseModel):
     meta: Optional[dict] = None
 
 
-class TrafficRecord(BaseModel):
+class TrafficRecord(StrictRequest):
     bytes_in: int
     bytes_out: int
     connections: int
     failed_auth: int = 0
 
 
-class IDSRequest(BaseModel):
+class IDSRequest(StrictRequest):
     logs: List[IDSLog] = []
     traffic: List[TrafficRecord] = []
 
 
+class IDSAnomaly(BaseModel):
+    index: int
+    score: float
+    record: TrafficRecord
+
+
 class IDSResponse(BaseModel):
-    anomalies: List[dict]
+    anomalies: List[IDSAnomaly]
     alert: bool
     score: float
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: int = Field(default_factory=epoch_ms)  # epoch milliseconds
 
 
-class TokenRequest(BaseModel):
+class TokenRequest(StrictRequest):
     user_id: str
 
 
@@ -99,7 +131,7 @@ class TokenResponse(BaseModel):
 
 
 # Anomaly detection
-class BehaviorAnomalyRequest(BaseModel):
+class BehaviorAnomalyRequest(StrictRequest):
     metrics: List[float]
 
 
@@ -109,7 +141,7 @@ class BehaviorAnomalyResponse(BaseModel):
     probability: float
 
 
-class SystemAnomalyRequest(BaseModel):
+class SystemAnomalyRequest(StrictRequest):
     metrics: List[float]
 
 
@@ -323,12 +355,19 @@ class PerformanceOptimizationResponse(BaseModel):
     recommendations: List[str]
 
 
+class RunningApp(BaseModel):
+    package: str
+    name: str
+    memory: float
+    importance: str
+
+
 class MemoryStatusResponse(BaseModel):
     total_ram: float
     available_ram: float
     used_ram: float
     usage_percent: float
-    running_apps: List[Dict[str, Any]]
+    running_apps: List[RunningApp]
     optimization_tips: List[str]
 
 
@@ -345,24 +384,65 @@ class NetworkSecurityScanRequest(BaseModel):
     include_firewall: bool = True
 
 
+class NetworkThreat(BaseModel):
+    type: str
+    description: str
+    severity: str
+    recommendation: str
+
+
+class WifiSecurity(BaseModel):
+    ssid: str
+    encryption: str
+    signal_strength: str
+    channel: int
+
+
 class NetworkSecurityScanResponse(BaseModel):
-    threats_detected: List[Dict[str, Any]]
+    threats_detected: List[NetworkThreat]
     open_ports: List[int]
-    wifi_security: Dict[str, Any]
+    wifi_security: WifiSecurity
     recommendations: List[str]
 
 
+class NetworkInfo(BaseModel):
+    type: str
+    ssid: Optional[str] = None
+    ip_address: Optional[str] = None
+    signal_strength: Optional[str] = None
+
+
+class NetworkUsageStats(BaseModel):
+    download_today: float
+    upload_today: float
+    download_speed: float
+    upload_speed: float
+
+
+class NetworkAppUsage(BaseModel):
+    name: str
+    package: str
+    download: float
+    upload: float
+
+
 class NetworkUsageResponse(BaseModel):
-    current_network: Dict[str, Any]
-    usage_stats: Dict[str, Any]
-    top_apps: List[Dict[str, Any]]
+    current_network: NetworkInfo
+    usage_stats: NetworkUsageStats
+    top_apps: List[NetworkAppUsage]
     connection_quality: str
 
 
 # Security dashboard
+class SecurityEvent(BaseModel):
+    title: str
+    severity: str
+    timestamp: int  # epoch milliseconds
+
+
 class SecurityOverviewResponse(BaseModel):
     security_score: int
-    threat_summary: Dict[str, Any]
-    recent_events: List[Dict[str, Any]]
+    threat_summary: Dict[str, int]
+    recent_events: List[SecurityEvent]
     recommendations: List[str]
     protection_modules: Dict[str, Any]
@@ -1,5 +1,8 @@
+import asyncio
+
 from fastapi import APIRouter, Depends
 
+from app.core.lazy_model import start_warm_up
 from app.core.security import get_current_user
 from app.models.schemas import (
     BehaviorAnomalyRequest,
@@ -13,14 +16,19 @@ from app.services.anomaly import behavior_anomaly_service, system_anomaly_servic
 router = APIRouter(prefix="/anomaly", tags=["Anomaly Detection"])
 
 
+@router.on_event("startup")
+async def warm_up_models():
+    start_warm_up(behavior_anomaly_service.warm_up, system_anomaly_service.warm_up)
+
+
 @router.post("/behavior", response_model=BehaviorAnomalyResponse)
 async def detect_behavior(request: BehaviorAnomalyRequest, current_user: dict = Depends(get_current_user)):
-    label, raw, probability = behavior_anomaly_service.score(request.metrics)
+    label, raw, probability = await asyncio.to_thread(behavior_anomaly_service.score, request.metrics)
     return BehaviorAnomalyResponse(label=label, score=raw, probability=probability)
 
 
 @router.post("/system", response_model=SystemAnomalyResponse)
 async def detect_system(request: SystemAnomalyRequest, current_user: dict = Depends(get_current_user)):
-    label, raw, probability = system_anomaly_service.score(request.metrics)
+    label, raw, probability = await asyncio.to_thread(system_anomaly_service.score, request.metrics)
     return SystemAnomalyResponse(label=label, score=raw, probability=probability)
 
@@ -1,6 +1,7 @@
-from datetime import datetime
+import asyncio
 from fastapi import APIRouter, Depends
 
+from app.core.clock import clock
 from app.core.security import get_current_user
 from app.models.schemas import BiometricAuthRequest, BiometricAuthResponse
 from app.services.biometric import biometric_service
@@ -11,6 +12,6 @@ router = APIRouter(prefix="/auth", tags=["biometric"])
 
 @router.post("/biometric", response_model=BiometricAuthResponse)
 async def biometric_auth(req: BiometricAuthRequest, user=Depends(get_current_user)):
-    match, prob, threshold = biometric_service.verify(req.user_id, req.sample.model_dump())
-    return BiometricAuthResponse(match=match, probability=prob, threshold=threshold, timestamp=datetime.utcnow())
+    match, prob, threshold = await asyncio.to_thread(biometric_service.verify, req.user_id, req.sample.model_dump())
+    return BiometricAuthResponse(match=match, probability=prob, threshold=threshold, timestamp=clock.now_ms)
 
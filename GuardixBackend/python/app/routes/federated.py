@@ -1,3 +1,5 @@
+import asyncio
+
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 from typing import List, Optional
@@ -26,6 +28,6 @@ router = APIRouter(prefix="/federated", tags=["federated"])
 async def aggregate(req: FedAggregateRequest, user=Depends(get_current_user)):
     weight_updates = [u.weights for u in req.updates]
     weights = [u.samples or 1 for u in req.updates]
-    agg = fedavg(weight_updates, weights)
+    agg = await asyncio.to_thread(fedavg, weight_updates, weights)
     return FedAggregateResponse(weights=agg)
 
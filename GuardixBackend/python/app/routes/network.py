@@ -1,8 +1,12 @@
 from fastapi import APIRouter, Depends
 import asyncio
-import random
 
+import numpy as np
+
+from app.core.config import settings
+from app.core.random_pool import pick, randint, random_pool, uniform
 from app.core.security import get_current_user
+from app.core.units import GB, MB
 from app.models.schemas import (
     NetworkSecurityScanRequest,
     NetworkSecurityScanResponse,
@@ -12,6 +16,15 @@ from app.models.schemas import (
 
 router = APIRouter(prefix="/network-tools", tags=["Network Tools"])
 
+_SCAN_PORTS = np.arange(1024, 1050)
+
+_NETSEC_RECOMMENDATIONS = (
+    "Update router firmware",
+    "Disable WPS if not required",
+    "Use strong WiFi password",
+    "Enable firewall intrusion detection",
+)
+
 
 @router.post("/security-scan", response_model=NetworkSecurityScanResponse)
 async def network_security_scan(
@@ -19,10 +32,13 @@ async def network_security_scan(
     current_user: dict = Depends(get_current_user),
 ):
     """Run a simulated network security scan."""
-    await asyncio.sleep(2)
+    if settings.simulate_latency:
+        await asyncio.sleep(2)
+
+    u = random_pool.take(5)
 
     threats = []
-    if request.include_wifi and random.random() > 0.6:
+    if request.include_wifi and u[0] > 0.6:
         threats.append(
             {
                 "type": "WiFi",
@@ -31,7 +47,7 @@ async def network_security_scan(
                 "recommendation": "Switch to WPA2/WPA3",
             }
         )
-    if request.include_firewall and random.random() > 0.7:
+    if request.include_firewall and u[1] > 0.7:
         threats.append(
             {
                 "type": "Firewall",
@@ -41,70 +57,66 @@ async def network_security_scan(
             }
         )
 
-    open_ports = sorted(random.sample(range(1024, 1050), k=5))
+    open_ports = sorted(random_pool.sample(_SCAN_PORTS, 5).tolist())
     wifi_security = {
         "ssid": "GuardixSecure",
-        "encryption": random.choice(["WPA2", "WPA3", "Open"]),
-        "signal_strength": f"-{random.randint(38, 62)} dBm",
-        "channel": random.randint(1, 11),
+        "encryption": pick(u[2], ("WPA2", "WPA3", "Open")),
+        "signal_strength": f"-{randint(u[3], 38, 62)} dBm",
+        "channel": randint(u[4], 1, 11),
     }
 
-    recommendations = [
-        "Update router firmware",
-        "Disable WPS if not required",
-        "Use strong WiFi password",
-        "Enable firewall intrusion detection",
-    ]
-
     return NetworkSecurityScanResponse(
         threats_detected=threats,
         open_ports=open_ports,
         wifi_security=wifi_security,
-        recommendations=recommendations,
+        recommendations=_NETSEC_RECOMMENDATIONS,
     )
 
 
 @router.get("/usage", response_model=NetworkUsageResponse)
 async def network_usage(current_user: dict = Depends(get_current_user)):
     """Return current network usage statistics."""
-    await asyncio.sleep(1)
+    if settings.simulate_latency:
+        await asyncio.sleep(1)
+
+    u = random_pool.take(14)
 
     current_network = {
-        "type": random.choice(["WiFi", "5G", "4G"]),
+        "type": pick(u[0], ("WiFi", "5G", "4G")),
         "ssid": "GuardixSecure",
-        "ip_address": f"192.168.0.{random.randint(2, 220)}",
-        "signal_strength": f"-{random.randint(38, 58)} dBm",
+        "ip_address": f"192.168.0.{randint(u[1], 2, 220)}",
+        "signal_strength": f"-{randint(u[2], 38, 58)} dBm",
     }
 
     usage_stats = {
-        "download_today": random.uniform(1.5, 4.5) * 1024 * 1024 * 1024,
-        "upload_today": random.uniform(0.5, 1.2) * 1024 * 1024 * 1024,
-        "download_speed": random.uniform(40, 180),
-        "upload_speed": random.uniform(15, 60),
+        "download_today": uniform(u[3], 1.5, 4.5) * GB,
+        "upload_today": uniform(u[4], 0.5, 1.2) * GB,
+        "download_speed": uniform(u[5], 40, 180),
+        "upload_speed": uniform(u[6], 15, 60),
     }
 
     top_apps = [
         {
             "name": "Streaming App",
             "package": "com.video.app",
-            "download": random.uniform(800, 1500) * 1024 * 1024,
-            "upload": random.uniform(50, 120) * 1024 * 1024,
+            "download": uniform(u[7], 800, 1500) * MB,
+            "upload": uniform(u[8], 50, 120) * MB,
         },
         {
             "name": "Cloud Backup",
             "package": "com.cloud.sync",
-            "download": random.uniform(300, 500) * 1024 * 1024,
-            "upload": random.uniform(400, 700) * 1024 * 1024,
+            "download": uniform(u[9], 300, 500) * MB,
+            "upload": uniform(u[10], 400, 700) * MB,
         },
         {
             "name": "Browser",
             "package": "com.browser.web",
-            "download": random.uniform(200, 400) * 1024 * 1024,
-            "upload": random.uniform(40, 90) * 1024 * 1024,
+            "download": uniform(u[11], 200, 400) * MB,
+            "upload": uniform(u[12], 40, 90) * MB,
         },
     ]
 
-    quality = random.choice(["Excellent", "Good", "Fair"])
+    quality = pick(u[13], ("Excellent", "Good", "Fair"))
 
     return NetworkUsageResponse(
         current_network=current_network,
@@ -112,4 +124,3 @@ async def network_usage(current_user: dict = Depends(get_current_user)):
         top_apps=top_apps,
         connection_quality=quality,
     )
-
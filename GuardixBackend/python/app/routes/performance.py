@@ -1,9 +1,11 @@
 from fastapi import APIRouter, Depends
 import asyncio
-import random
-from datetime import datetime
 
+from app.core.clock import clock
+from app.core.config import settings
+from app.core.random_pool import randint, random_pool, uniform
 from app.core.security import get_current_user
+from app.core.units import GB, MB
 from app.models.schemas import (
     PerformanceOptimizationRequest,
     PerformanceOptimizationResponse,
@@ -15,27 +17,42 @@ from app.models.schemas import (
 router = APIRouter(prefix="/performance", tags=["Performance & Optimization"])
 
 
+_ONE_TAP_RECOMMENDATIONS = (
+    "Enable scheduled optimizations",
+    "Limit auto-start applications",
+    "Reduce background sync interval",
+    "Review high power consumption apps",
+)
+_AGGRESSIVE_RECOMMENDATIONS = _ONE_TAP_RECOMMENDATIONS + ("Consider disabling animations for additional savings",)
+_MEMORY_TIPS = (
+    "Close unused foreground apps",
+    "Disable auto-start for rarely used apps",
+    "Enable smart memory cleaner",
+)
+_COOLING_RECOMMENDATIONS = (
+    "Close intensive games",
+    "Lower screen brightness",
+    "Avoid charging while gaming",
+)
+_SEVERE_COOLING_RECOMMENDATIONS = _COOLING_RECOMMENDATIONS + ("Power off for a few minutes to cool",)
+
+
 @router.post("/one-tap", response_model=PerformanceOptimizationResponse)
 async def one_tap_optimization(
     request: PerformanceOptimizationRequest,
     current_user: dict = Depends(get_current_user),
 ):
     """Simulate a one-tap performance optimization."""
-    await asyncio.sleep(2)
-
-    memory_freed = random.uniform(350, 850) * 1024 * 1024
-    storage_freed = random.uniform(200, 600) * 1024 * 1024 if request.include_storage_clean else 0.0
-    apps_optimized = random.randint(5, 18)
-    battery_gain = random.randint(8, 22)
-
-    recommendations = [
-        "Enable scheduled optimizations",
-        "Limit auto-start applications",
-        "Reduce background sync interval",
-        "Review high power consumption apps",
-    ]
-    if request.aggressive_mode:
-        recommendations.append("Consider disabling animations for additional savings")
+    if settings.simulate_latency:
+        await asyncio.sleep(2)
+
+    u = random_pool.take(4)
+    memory_freed = uniform(u[0], 350, 850) * MB
+    storage_freed = uniform(u[1], 200, 600) * MB if request.include_storage_clean else 0.0
+    apps_optimized = randint(u[2], 5, 18)
+    battery_gain = randint(u[3], 8, 22)
+
+    recommendations = _AGGRESSIVE_RECOMMENDATIONS if request.aggressive_mode else _ONE_TAP_RECOMMENDATIONS
 
     return PerformanceOptimizationResponse(
         success=True,
@@ -43,7 +60,7 @@ async def one_tap_optimization(
         storage_freed=storage_freed,
         apps_optimized=apps_optimized,
         battery_life_improvement=battery_gain,
-        optimization_time=datetime.utcnow().isoformat(),
+        optimization_time=clock.now_iso,
         recommendations=recommendations,
     )
 
@@ -51,51 +68,46 @@ async def one_tap_optimization(
 @router.get("/memory", response_model=MemoryStatusResponse)
 async def memory_status(current_user: dict = Depends(get_current_user)):
     """Return current memory usage snapshot."""
-    total_ram = 6 * 1024 * 1024 * 1024  # 6GB
-    used_ram = random.uniform(2.5, 4.8) * 1024 * 1024 * 1024
+    u = random_pool.take(4)
+    total_ram = 6 * GB
+    used_ram = uniform(u[0], 2.5, 4.8) * GB
     available_ram = total_ram - used_ram
 
     running_apps = [
         {
             "package": "com.social.app",
             "name": "Social Feed",
-            "memory": random.uniform(180, 320) * 1024 * 1024,
+            "memory": uniform(u[1], 180, 320) * MB,
             "importance": "foreground",
         },
         {
             "package": "com.mail.app",
             "name": "Mail",
-            "memory": random.uniform(90, 150) * 1024 * 1024,
+            "memory": uniform(u[2], 90, 150) * MB,
             "importance": "background",
         },
         {
             "package": "com.music.app",
             "name": "Music Player",
-            "memory": random.uniform(80, 120) * 1024 * 1024,
+            "memory": uniform(u[3], 80, 120) * MB,
             "importance": "cached",
         },
     ]
 
-    tips = [
-        "Close unused foreground apps",
-        "Disable auto-start for rarely used apps",
-        "Enable smart memory cleaner",
-    ]
-
     return MemoryStatusResponse(
         total_ram=total_ram,
         available_ram=available_ram,
         used_ram=used_ram,
         usage_percent=(used_ram / total_ram) * 100,
         running_apps=running_apps,
-        optimization_tips=tips,
+        optimization_tips=_MEMORY_TIPS,
     )
 
 
 @router.get("/thermal", response_model=ThermalStatusResponse)
 async def thermal_status(current_user: dict = Depends(get_current_user)):
     """Return device thermal readings."""
-    temperature = random.uniform(32.5, 49.5)
+    temperature = uniform(random_pool.take(1)[0], 32.5, 49.5)
     if temperature < 38:
         state = "NORMAL"
     elif temperature < 42:
@@ -105,13 +117,7 @@ async def thermal_status(current_user: dict = Depends(get_current_user)):
     else:
         state = "SEVERE"
 
-    recommendations = [
-        "Close intensive games",
-        "Lower screen brightness",
-        "Avoid charging while gaming",
-    ]
-    if state == "SEVERE":
-        recommendations.append("Power off for a few minutes to cool")
+    recommendations = _SEVERE_COOLING_RECOMMENDATIONS if state == "SEVERE" else _COOLING_RECOMMENDATIONS
 
     return ThermalStatusResponse(
         temperature=temperature,
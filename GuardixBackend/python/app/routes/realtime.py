@@ -17,17 +17,16 @@ async def websocket_endpoint(
     token: Optional[str] = Query(None),
     data_types: Optional[str] = Query("all")
 ):
-    connection_id = str(uuid.uuid4())
+    connection_id = uuid.uuid4().hex
     user_id = None
     
     # Authenticate if token is provided
     if token:
-        try:
-            user = await get_current_user_ws(token)
-            user_id = user.get("sub")
-        except Exception as e:
+        user = await get_current_user_ws(token)
+        if user is None:
             await websocket.close(code=1008, reason="Authentication failed")
             return
+        user_id = user.get("sub")
     
     # Accept connection
     await manager.connect(websocket, connection_id, user_id)
@@ -35,40 +34,25 @@ async def websocket_endpoint(
     # Parse requested data types
     requested_types = data_types.split(",") if data_types != "all" else ["all"]
     
-    # Start data streaming task
-    streaming_task = None
+    # Define callback for sending data
+    async def send_data(data):
+        data_type = data.get("type", "unknown")
+        if "all" in requested_types or data_type in requested_types:
+            await manager.send_personal_message(data, connection_id)
     
     try:
-        # Define callback for sending data
-        async def send_data(data):
-            data_type = data.get("type", "unknown")
-            if "all" in requested_types or data_type in requested_types:
-                await manager.send_personal_message(data, connection_id)
-        
-        # Start streaming task
-        streaming_task = asyncio.create_task(
-            realtime_service.start_data_stream(send_data, interval=1.0)
-        )
-        
-        # Keep connection alive
-        while True:
-            # Wait for client messages (can be used for control commands)
-            data = await websocket.receive_text()
-            logger.debug(f"Received message from client {connection_id}: {data}")
-            
-    except WebSocketDisconnect:
+        # The task group cancels the stream as soon as the receive loop exits with an error
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(realtime_service.start_data_stream(send_data, interval=1.0))
+            # Keep connection alive; client messages can be used for control commands
+            while True:
+                data = await websocket.receive_text()
+                logger.debug(f"Received message from client {connection_id}: {data}")
+    except* WebSocketDisconnect:
         logger.info(f"Client {connection_id} disconnected")
-    except Exception as e:
-        logger.error(f"Error in WebSocket connection {connection_id}: {str(e)}")
+    except* Exception as eg:
+        logger.error(f"Error in WebSocket connection {connection_id}: {eg.exceptions!r}")
     finally:
-        # Clean up
-        if streaming_task:
-            streaming_task.cancel()
-            try:
-                await streaming_task
-            except asyncio.CancelledError:
-                pass
-        
         manager.disconnect(connection_id, user_id)
 
 @router.get("/status")
@@ -1,28 +1,46 @@
-from datetime import datetime
+import asyncio
+
 from fastapi import APIRouter, Depends, HTTPException
 
+from app.core.clock import clock
+from app.core.lazy_model import start_warm_up
 from app.core.security import get_current_user
 from app.models.schemas import (
+    APKBatchScanRequest,
+    APKBatchScanResponse,
     APKScanRequest,
     APKScanResponse,
+    PhishingBatchScanRequest,
+    PhishingBatchScanResponse,
     PhishingScanRequest,
     PhishingScanResponse,
     ScanClassification,
 )
 from app.services.malware import malware_service
-from app.services.phishing import phishing_service
+from app.services.phishing import phishing_service, scan_content
 
 
 router = APIRouter(prefix="/scan", tags=["scan"])
 
 
+@router.on_event("startup")
+async def warm_up_models():
+    start_warm_up(malware_service.warm_up, phishing_service.warm_up)
+
+
+@router.on_event("shutdown")
+async def stop_batchers():
+    await malware_service.close()
+    await phishing_service.close()
+
+
 @router.post("/apk", response_model=APKScanResponse)
 async def scan_apk(req: APKScanRequest, user=Depends(get_current_user)):
-    label, prob = malware_service.predict(req.features.model_dump())
+    label, prob = await malware_service.predict_async(req.features.model_dump())
     return APKScanResponse(
         scan_id=malware_service.new_scan_id(),
         classification=ScanClassification(label=label, probability=prob),
-        timestamp=datetime.utcnow(),
+        timestamp=clock.now_ms,
     )
 
 
@@ -30,11 +48,46 @@ async def scan_apk(req: APKScanRequest, user=Depends(get_current_user)):
 async def scan_phishing(req: PhishingScanRequest, user=Depends(get_current_user)):
     if not (req.url or req.text):
         raise HTTPException(status_code=400, detail="Provide url or text")
-    prob = phishing_service.score(req.url, req.text)
+    prob = await phishing_service.score_async(req.url, req.text)
     return PhishingScanResponse(
         scan_id=phishing_service.new_scan_id(),
         probability=prob,
         is_phishing=prob >= 0.5,
-        timestamp=datetime.utcnow(),
+        timestamp=clock.now_ms,
     )
 
+
+@router.post("/apk/batch", response_model=APKBatchScanResponse)
+async def scan_apk_batch(req: APKBatchScanRequest, user=Depends(get_current_user)):
+    predictions = await asyncio.to_thread(malware_service.predict_batch, [item.features.model_dump() for item in req.items])
+    now = clock.now_ms
+    return APKBatchScanResponse(
+        results=[
+            APKScanResponse(
+                scan_id=malware_service.new_scan_id(),
+                classification=ScanClassification(label=label, probability=prob),
+                timestamp=now,
+            )
+            for label, prob in predictions
+        ]
+    )
+
+
+@router.post("/phishing/batch", response_model=PhishingBatchScanResponse)
+async def scan_phishing_batch(req: PhishingBatchScanRequest, user=Depends(get_current_user)):
+    for i, item in enumerate(req.items):
+        if not (item.url or item.text):
+            raise HTTPException(status_code=400, detail=f"Item {i}: provide url or text")
+    probs = await asyncio.to_thread(phishing_service.score_batch, [scan_content(item.url, item.text) for item in req.items])
+    now = clock.now_ms
+    return PhishingBatchScanResponse(
+        results=[
+            PhishingScanResponse(
+                scan_id=phishing_service.new_scan_id(),
+                probability=prob,
+                is_phishing=prob >= 0.5,
+                timestamp=now,
+            )
+            for prob in probs
+        ]
+    )
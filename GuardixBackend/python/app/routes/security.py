@@ -1,20 +1,39 @@
-from fastapi import APIRouter, Depends
-import asyncio
+from functools import lru_cache
 import random
-from datetime import datetime, timedelta
+import time
+from typing import Dict, List, Tuple
+
+from fastapi import APIRouter, Depends
 
+from app.core.clock import clock
 from app.core.security import get_current_user
 from app.models.schemas import SecurityOverviewResponse
 
 
 router = APIRouter(prefix="/security-tools", tags=["Security Tools"])
 
+HOUR_MS = 3600 * 1000
+
+_RECOMMENDATIONS = (
+    "Run a full malware scan weekly",
+    "Review app permissions",
+    "Enable automatic cloud backups",
+    "Keep system and apps updated",
+)
+
+_PROTECTION_MODULES = {
+    "malware_protection": {"status": "active", "updated": "today"},
+    "phishing_defense": {"status": "active", "updated": "today"},
+    "biometric_auth": {"status": "configured", "strength": "high"},
+}
+
+
+_SAMPLE_PERIOD_S = 5
 
-@router.get("/overview", response_model=SecurityOverviewResponse)
-async def security_overview(current_user: dict = Depends(get_current_user)):
-    """Provide a consolidated security dashboard summary."""
-    await asyncio.sleep(1)
 
+@lru_cache(maxsize=1)
+def _sampled_state(bucket: int) -> Tuple[int, Dict[str, int]]:
+    """Simulated score and threat counts, redrawn once per `_SAMPLE_PERIOD_S` window."""
     score = random.randint(78, 96)
     threat_summary = {
         "malware": random.randint(0, 2),
@@ -22,51 +41,30 @@ async def security_overview(current_user: dict = Depends(get_current_user)):
         "privacy": random.randint(0, 3),
         "system": random.randint(0, 1),
     }
+    return score, threat_summary
 
+
+def _events(now: int, threat_summary: Dict[str, int]) -> List[dict]:
     events = []
-    now = datetime.utcnow()
     if threat_summary["malware"]:
-        events.append(
-            {
-                "title": "Suspicious APK quarantined",
-                "severity": "high",
-                "timestamp": (now - timedelta(hours=2)).isoformat(),
-            }
-        )
-    events.append(
-        {
-            "title": "Real-time protection active",
-            "severity": "info",
-            "timestamp": (now - timedelta(hours=1)).isoformat(),
-        }
-    )
-    events.append(
-        {
-            "title": "Network scan completed",
-            "severity": "info",
-            "timestamp": (now - timedelta(hours=4)).isoformat(),
-        }
-    )
+        events.append({"title": "Suspicious APK quarantined", "severity": "high", "timestamp": now - 2 * HOUR_MS})
+    events.append({"title": "Real-time protection active", "severity": "info", "timestamp": now - 1 * HOUR_MS})
+    events.append({"title": "Network scan completed", "severity": "info", "timestamp": now - 4 * HOUR_MS})
+    return events
 
-    recommendations = [
-        "Run a full malware scan weekly",
-        "Review app permissions",
-        "Enable automatic cloud backups",
-        "Keep system and apps updated",
-    ]
-
-    modules = {
-        "malware_protection": {"status": "active", "updated": "today"},
-        "phishing_defense": {"status": "active", "updated": "today"},
-        "biometric_auth": {"status": "configured", "strength": "high"},
-        "ids_monitor": {"status": "monitoring", "alerts": threat_summary["network"]},
-    }
 
+@router.get("/overview", response_model=SecurityOverviewResponse)
+async def security_overview(current_user: dict = Depends(get_current_user)):
+    """Provide a consolidated security dashboard summary."""
+    score, threat_summary = _sampled_state(int(time.time()) // _SAMPLE_PERIOD_S)
+    modules = dict(
+        _PROTECTION_MODULES,
+        ids_monitor={"status": "monitoring", "alerts": threat_summary["network"]},
+    )
     return SecurityOverviewResponse(
         security_score=score,
         threat_summary=threat_summary,
-        recent_events=events,
-        recommendations=recommendations,
+        recent_events=_events(clock.now_ms, threat_summary),
+        recommendations=_RECOMMENDATIONS,
         protection_modules=modules,
     )
-
@@ -1,4 +1,6 @@
+import math
 import os
+from functools import cached_property
 from typing import Tuple
 
 import joblib
@@ -7,6 +9,7 @@ from sklearn.svm import OneClassSVM
 from sklearn.neighbors import LocalOutlierFactor
 
 from app.core.config import settings
+from app.core.lazy_model import LazyModel
 
 
 PROFILE = settings.resolve_profile(None)
@@ -14,16 +17,34 @@ BEHAVIOR_MODEL_PATH = os.path.join(settings.models_dir, f"behavior_anomaly_{PROF
 SYSTEM_MODEL_PATH = os.path.join(settings.models_dir, f"system_anomaly_{PROFILE}.joblib")
 
 
-class BehaviorAnomalyService:
+def _sigmoid(x: float) -> float:
+    # Branch on sign so exp() never overflows
+    if x >= 0:
+        return 1.0 / (1.0 + math.exp(-x))
+    z = math.exp(x)
+    return z / (1.0 + z)
+
+
+class BehaviorAnomalyService(LazyModel):
     def __init__(self) -> None:
+        super().__init__()
         self.profile = PROFILE
         self.algorithm = "OneClassSVM"
-        self.model = None
-        self._ensure_model()
+
+    @cached_property
+    def _kernel(self) -> Tuple[np.ndarray, np.ndarray, float, float]:
+        # Pull the fitted RBF expansion out of the model so scoring a single sample is a few
+        # NumPy ops instead of a decision_function round trip through validation and libsvm
+        return (
+            np.ascontiguousarray(self.model.support_vectors_, dtype=float),
+            np.ascontiguousarray(self.model.dual_coef_[0], dtype=float),
+            float(self.model._gamma),
+            float(self.model.intercept_[0]),
+        )
 
     def _ensure_model(self) -> None:
         if os.path.exists(BEHAVIOR_MODEL_PATH):
-            self.model = joblib.load(BEHAVIOR_MODEL_PATH)
+            self._model = joblib.load(BEHAVIOR_MODEL_PATH, mmap_mode="r")
             return
 
         rng = np.random.default_rng(42)
@@ -38,17 +59,26 @@ class BehaviorAnomalyService:
             ]
         )
 
-        self.model = OneClassSVM(kernel="rbf", gamma="scale", nu=0.05)
-        self.model.fit(normal)
-        joblib.dump(self.model, BEHAVIOR_MODEL_PATH)
+        model = OneClassSVM(kernel="rbf", gamma="scale", nu=0.05)
+        model.fit(normal)
+        joblib.dump(model, BEHAVIOR_MODEL_PATH)
+        self._model = model
 
     def score(self, metrics: list[float]) -> Tuple[str, float, float]:
-        arr = np.array(metrics, dtype=float).reshape(1, -1)
-        raw = float(self.model.decision_function(arr)[0])
-        probability = float(1.0 / (1.0 + np.exp(-raw)))
+        support_vectors, dual_coef, gamma, intercept = self._kernel
+        x = np.asarray(metrics, dtype=float)
+        if x.shape != support_vectors.shape[1:]:
+            raise ValueError(f"expected {support_vectors.shape[1]} metrics, got {x.size}")
+        diff = support_vectors - x
+        sq_dist = np.einsum("ij,ij->i", diff, diff)
+        raw = float(dual_coef @ np.exp(-gamma * sq_dist)) + intercept
+        probability = _sigmoid(raw)
         label = "anomaly" if raw < 0 else "normal"
         return label, raw, probability
 
+    def warm_up(self) -> None:
+        self.score([0.0] * self.model.n_features_in_)
+
     def info(self) -> dict:
         return {
             "name": "behavior_anomaly",
@@ -58,16 +88,15 @@ class BehaviorAnomalyService:
         }
 
 
-class SystemAnomalyService:
+class SystemAnomalyService(LazyModel):
     def __init__(self) -> None:
+        super().__init__()
         self.profile = PROFILE
         self.algorithm = "LocalOutlierFactor"
-        self.model = None
-        self._ensure_model()
 
     def _ensure_model(self) -> None:
         if os.path.exists(SYSTEM_MODEL_PATH):
-            self.model = joblib.load(SYSTEM_MODEL_PATH)
+            self._model = joblib.load(SYSTEM_MODEL_PATH, mmap_mode="r")
             return
 
         rng = np.random.default_rng(21)
@@ -80,18 +109,28 @@ class SystemAnomalyService:
             ]
         )
 
-        model = LocalOutlierFactor(n_neighbors=20, novelty=True, contamination=0.08)
+        # kd-tree suits the 4-D inputs; the fitted tree is pickled with the model, so loads don't rebuild it
+        model = LocalOutlierFactor(
+            n_neighbors=10 if self.profile == "lite" else 20,
+            algorithm="kd_tree",
+            leaf_size=40,
+            novelty=True,
+            contamination=0.08,
+        )
         model.fit(baseline)
         joblib.dump(model, SYSTEM_MODEL_PATH)
-        self.model = model
+        self._model = model
 
     def score(self, metrics: list[float]) -> Tuple[str, float, float]:
         arr = np.array(metrics, dtype=float).reshape(1, -1)
         raw = float(self.model.decision_function(arr)[0])
-        probability = float(1.0 / (1.0 + np.exp(-raw)))
+        probability = _sigmoid(raw)
         label = "anomaly" if raw < 0 else "normal"
         return label, raw, probability
 
+    def warm_up(self) -> None:
+        self.score([0.0] * self.model.n_features_in_)
+
     def info(self) -> dict:
         return {
             "name": "system_anomaly",
@@ -103,4 +142,3 @@ class SystemAnomalyService:
 
 behavior_anomaly_service = BehaviorAnomalyService()
 system_anomaly_service = SystemAnomalyService()
-
@@ -1,22 +1,42 @@
+import math
 from typing import Tuple
+
 import numpy as np
 
 from app.core.config import settings
 from app.db.memory import memdb
 
 
+def _mean_std(values) -> Tuple[float, float]:
+    # One pass over a short Python list; cheaper than building an ndarray per signal
+    n = len(values)
+    if n == 0:
+        return 0.0, 0.0
+    # Sums of offsets from the first value: the same single pass, without the cancellation of
+    # sumsq/n - mean**2 when values are large next to their spread
+    shift = values[0] if math.isfinite(values[0]) else 0.0
+    total = sumsq = 0.0
+    for v in values:
+        d = v - shift
+        total += d
+        sumsq += d * d
+    mean = shift + total / n
+    if n == 1:
+        return mean, 0.0
+    return mean, math.sqrt(max(0.0, (sumsq - total * total / n) / n))
+
+
 def _feature_vector(sample: dict) -> np.ndarray:
     # Simple feature composition; real system would be richer
-    kt = np.array(sample.get("keystroke_timings", []) or [0.0])
-    tp = np.array(sample.get("touch_pressure", []) or [0.0])
-    ti = np.array(sample.get("touch_intervals", []) or [0.0])
-    # Aggregate statistics
-    feats = [
-        kt.mean(), kt.std() if kt.size > 1 else 0.0,
-        tp.mean(), tp.std() if tp.size > 1 else 0.0,
-        ti.mean(), ti.std() if ti.size > 1 else 0.0,
-    ]
-    return np.nan_to_num(np.array(feats, dtype=float))
+    feats = (
+        *_mean_std(sample.get("keystroke_timings") or ()),
+        *_mean_std(sample.get("touch_pressure") or ()),
+        *_mean_std(sample.get("touch_intervals") or ()),
+    )
+    vec = np.fromiter(feats, dtype=np.float32, count=6)
+    # Empty signals already map to 0.0; this only catches NaN/inf sent in the sample itself
+    # (the JSON decoder accepts them), and scrubs in place rather than copying
+    return np.nan_to_num(vec, copy=False)
 
 
 PROFILE = settings.resolve_profile(None)
@@ -28,23 +48,24 @@ class BiometricService:
         self.algorithm = "CosineSimilarity"
 
     def enroll(self, user_id: str, sample: dict) -> dict:
-        vec = _feature_vector(sample)
-        profile = {"mean": vec.tolist()}
-        memdb.set_biometric_profile(user_id, profile)
-        return profile
+        return {"mean_unit": self._enroll_vector(user_id, _feature_vector(sample)).tolist()}
+
+    def _enroll_vector(self, user_id: str, vec: np.ndarray) -> np.ndarray:
+        # Templates are stored L2-normalised, so verification needs only the sample's norm
+        unit = vec / (float(np.linalg.norm(vec)) or 1e-6)
+        memdb.set_biometric_profile(user_id, unit)
+        return unit
 
     def verify(self, user_id: str, sample: dict, threshold: float | None = None) -> Tuple[bool, float, float]:
         if threshold is None:
             threshold = 0.8 if self.profile == "lite" else 0.85
-        profile = memdb.get_biometric_profile(user_id)
-        if not profile:
-            # Auto-enroll on first use for demo
-            profile = self.enroll(user_id, sample)
-        mean = np.array(profile["mean"])
         vec = _feature_vector(sample)
+        mean_unit = memdb.get_biometric_profile(user_id)
+        if mean_unit is None:
+            # Auto-enroll on first use for demo
+            mean_unit = self._enroll_vector(user_id, vec)
         # Cosine similarity as a simple proxy
-        denom = (np.linalg.norm(mean) * np.linalg.norm(vec)) or 1e-6
-        sim = float(np.dot(mean, vec) / denom)
+        sim = float(mean_unit @ vec) / (float(np.linalg.norm(vec)) or 1e-6)
         return sim >= threshold, sim, threshold
 
     def info(self) -> dict:
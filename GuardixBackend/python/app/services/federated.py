@@ -5,12 +5,17 @@ import numpy as np
 def fedavg(weight_updates: List[List[float]], weights: List[int] | None = None) -> List[float]:
     if not weight_updates:
         return []
-    arrs = [np.array(w) for w in weight_updates]
     if weights is None:
-        weights = [1] * len(arrs)
-    weights = np.array(weights, dtype=float)
-    weights = weights / (weights.sum() or 1.0)
-    stacked = np.stack(arrs)
-    avg = (stacked * weights[:, None]).sum(axis=0)
-    return avg.tolist()
-
+        weights = [1] * len(weight_updates)
+    norm = float(sum(weights)) or 1.0
+    # Running weighted sum, one client at a time: peak memory is O(params) rather than a
+    # (clients x params) stack, and each update is read once. float32 halves the traffic.
+    acc = np.zeros(len(weight_updates[0]), dtype=np.float32)
+    scaled = np.empty_like(acc)
+    for w, update in zip(weights, weight_updates):
+        update = np.asarray(update, dtype=np.float32)
+        if update.shape != acc.shape:
+            raise ValueError(f"weight update has {update.size} parameters, expected {acc.size}")
+        np.multiply(update, w / norm, out=scaled)
+        acc += scaled
+    return acc.tolist()
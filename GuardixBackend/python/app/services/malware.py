@@ -1,6 +1,5 @@
 import os
 from typing import List, Tuple
-from uuid import uuid4
 
 import joblib
 import numpy as np
@@ -8,7 +7,10 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.pipeline import FeatureUnion
 from sklearn.preprocessing import FunctionTransformer
 
+from app.core.batcher import MicroBatcher
 from app.core.config import settings
+from app.core.lazy_model import LazyModel
+from app.core.sequence import IdSequence
 
 
 PROFILE = settings.resolve_profile(None)
@@ -84,21 +86,22 @@ def make_pipeline(*steps):
     return Pipeline(steps=steps)
 
 
-class MalwareService:
+class MalwareService(LazyModel):
     def __init__(self) -> None:
-        self.model = None
+        super().__init__()
         self.labels = ["safe", "suspicious", "malicious"]
         self.profile = PROFILE
+        self._ids = IdSequence("apk")
         self.algorithm = "MultinomialNB" if self.profile == "lite" else "RandomForest"
-        self._ensure_model()
+        self._batcher = MicroBatcher(self.predict_batch)
 
     def _ensure_model(self):
         if os.path.exists(MODEL_PATH):
-            self.model = joblib.load(MODEL_PATH)
+            self._model = joblib.load(MODEL_PATH, mmap_mode="r")
             return
 
         # Train a tiny placeholder model on synthetic data for demo purposes
-        self.model = _build_pipeline(self.profile)
+        model = _build_pipeline(self.profile)
         X = [
             {"permissions": ["INTERNET", "ACCESS_WIFI_STATE"], "api_calls": ["okhttp", "retrofit"], "behaviors": ["net"]},
             {"permissions": ["READ_SMS", "RECEIVE_SMS"], "api_calls": ["sendTextMessage"], "behaviors": ["sms"]},
@@ -106,16 +109,34 @@ class MalwareService:
             {"permissions": ["SYSTEM_ALERT_WINDOW"], "api_calls": ["exec"], "behaviors": ["root", "overlay"]},
         ]
         y = [0, 2, 1, 2]  # simple labels
-        self.model.fit(X, y)
-        joblib.dump(self.model, MODEL_PATH)
+        model.fit(X, y)
+        joblib.dump(model, MODEL_PATH)
+        self._model = model
 
     def predict(self, features: dict) -> Tuple[str, float]:
-        proba = self.model.predict_proba([features])[0]
-        idx = int(np.argmax(proba))
-        return self.labels[idx], float(proba[idx])
+        return self.predict_batch([features])[0]
+
+    def predict_batch(self, features: List[dict]) -> List[Tuple[str, float]]:
+        """Label and confidence for each feature dict, in one predict_proba call."""
+        if not features:
+            return []
+        proba = self.model.predict_proba(features)
+        idx = proba.argmax(axis=1)
+        return [(self.labels[i], float(p)) for i, p in zip(idx, proba[np.arange(len(idx)), idx])]
+
+    async def predict_async(self, features: dict) -> Tuple[str, float]:
+        """Like predict, but coalesced with concurrent requests into one predict_proba call."""
+        return await self._batcher.submit(features)
+
+    async def close(self) -> None:
+        """Stop the request batcher (app shutdown)."""
+        await self._batcher.close()
 
     def new_scan_id(self) -> str:
-        return f"apk_{uuid4()}"
+        return self._ids.next()
+
+    def warm_up(self) -> None:
+        self.predict({"permissions": [], "api_calls": [], "metadata": {}, "behaviors": []})
 
     def info(self) -> dict:
         return {
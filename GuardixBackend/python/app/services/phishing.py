@@ -1,14 +1,16 @@
 import os
-from typing import Tuple
-from uuid import uuid4
+from typing import List, Tuple
 
 import joblib
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
 from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.pipeline import make_pipeline
 
+from app.core.batcher import MicroBatcher
 from app.core.config import settings
+from app.core.lazy_model import LazyModel
+from app.core.sequence import IdSequence
 
 
 PROFILE = settings.resolve_profile(None)
@@ -28,38 +30,62 @@ def _default_corpus():
     return X, y
 
 
-class PhishingService:
+def scan_content(url, text: str | None) -> str:
+    # url may arrive as a pydantic Url object; the vectorizer needs plain text
+    return text or (str(url) if url else "")
+
+
+class PhishingService(LazyModel):
     def __init__(self) -> None:
-        self.model = None
+        super().__init__()
         self.profile = PROFILE
+        self._ids = IdSequence("phish")
         self.algorithm = "SGDClassifier" if self.profile == "lite" else "LogisticRegression"
-        self._ensure_model()
+        self._batcher = MicroBatcher(self.score_batch)
 
     def _ensure_model(self):
         if os.path.exists(MODEL_PATH):
-            self.model = joblib.load(MODEL_PATH)
+            self._model = joblib.load(MODEL_PATH, mmap_mode="r")
             return
         X, y = _default_corpus()
-        vectorizer_kwargs = {
-            "ngram_range": (1, 1 if self.profile == "lite" else 2),
-            "min_df": 1,
-            "max_features": 300 if self.profile == "lite" else 1200,
-        }
+        # Hashing instead of a fitted vocabulary: no dict lookups per token at inference time
+        vectorizer = HashingVectorizer(
+            ngram_range=(1, 1 if self.profile == "lite" else 2),
+            n_features=2**14,
+            alternate_sign=False,
+            norm=None,
+        )
         if self.profile == "lite":
             classifier = SGDClassifier(loss="log_loss", max_iter=200, tol=1e-3, random_state=42)
         else:
             classifier = LogisticRegression(max_iter=400)
-        self.model = make_pipeline(TfidfVectorizer(**vectorizer_kwargs), classifier)
-        self.model.fit(X, y)
-        joblib.dump(self.model, MODEL_PATH)
+        model = make_pipeline(vectorizer, TfidfTransformer(), classifier)
+        model.fit(X, y)
+        joblib.dump(model, MODEL_PATH)
+        self._model = model
 
     def score(self, url: str | None, text: str | None) -> float:
-        content = text or url or ""
-        proba = self.model.predict_proba([content])[0]
-        return float(proba[1])
+        return self.score_batch([scan_content(url, text)])[0]
+
+    def score_batch(self, contents: List[str]) -> List[float]:
+        """Phishing probability for each content string, in one predict_proba call."""
+        if not contents:
+            return []
+        return self.model.predict_proba(contents)[:, 1].tolist()
+
+    async def score_async(self, url: str | None, text: str | None) -> float:
+        """Like score, but coalesced with concurrent requests into one predict_proba call."""
+        return await self._batcher.submit(scan_content(url, text))
+
+    async def close(self) -> None:
+        """Stop the request batcher (app shutdown)."""
+        await self._batcher.close()
 
     def new_scan_id(self) -> str:
-        return f"phish_{uuid4()}"
+        return self._ids.next()
+
+    def warm_up(self) -> None:
+        self.score(None, "warmup")
 
     def info(self) -> dict:
         return {
@@ -1,6 +1,6 @@
 from fastapi import WebSocket
 from typing import Dict, List, Any
-import json
+import orjson
 import asyncio
 import logging
 from datetime import datetime
@@ -49,7 +49,7 @@ class ConnectionManager:
             websocket = self.active_connections[connection_id]
             if isinstance(message, dict):
                 message = {**message, "timestamp": datetime.utcnow().isoformat()}
-                await websocket.send_json(message)
+                await websocket.send_text(orjson.dumps(message).decode())
             else:
                 await websocket.send_text(str(message))
                 
@@ -57,7 +57,7 @@ class ConnectionManager:
         """Broadcast a message to all connected clients"""
         if isinstance(message, dict):
             message = {**message, "timestamp": datetime.utcnow().isoformat()}
-            json_message = json.dumps(message)
+            json_message = orjson.dumps(message).decode()
             for connection in self.active_connections.values():
                 await connection.send_text(json_message)
         else:
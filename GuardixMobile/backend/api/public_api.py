@@ -1,8 +1,17 @@
-from fastapi import APIRouter, Header
+from fastapi import APIRouter, Header, Request
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+from functools import lru_cache
+import hashlib
 import random
+import re
+import secrets
+import time
+
+import numpy as np
+import orjson
 
 router = APIRouter()
 
@@ -10,23 +19,23 @@ router = APIRouter()
 # ====== Schemas aligned with the Android app DTOs ======
 
 class TokenRequestDto(BaseModel):
-    user_id: str = Field(alias="user_id")
+    user_id: str
 
 
 class TokenResponseDto(BaseModel):
-    access_token: str = Field(alias="access_token")
-    token_type: str = Field(alias="token_type")
+    access_token: str
+    token_type: str
 
 
 class ApkFeatureDto(BaseModel):
     permissions: List[str] = []
-    api_calls: List[str] = Field(default_factory=list, alias="api_calls")
+    api_calls: List[str] = Field(default_factory=list)
     behaviors: List[str] = []
     metadata: Dict[str, str] = {}
 
 
 class ApkScanRequestDto(BaseModel):
-    package_name: Optional[str] = Field(default=None, alias="package_name")
+    package_name: Optional[str] = None
     features: ApkFeatureDto
 
 
@@ -36,7 +45,7 @@ class ScanClassificationDto(BaseModel):
 
 
 class ApkScanResponseDto(BaseModel):
-    scan_id: str = Field(alias="scan_id")
+    scan_id: str
     classification: ScanClassificationDto
     timestamp: str
 
@@ -47,9 +56,9 @@ class PhishingScanRequestDto(BaseModel):
 
 
 class PhishingScanResponseDto(BaseModel):
-    scan_id: str = Field(alias="scan_id")
+    scan_id: str
     probability: float
-    is_phishing: bool = Field(alias="is_phishing")
+    is_phishing: bool
     timestamp: str
 
 
@@ -60,7 +69,7 @@ class BiometricSampleDto(BaseModel):
 
 
 class BiometricAuthRequestDto(BaseModel):
-    user_id: str = Field(alias="user_id")
+    user_id: str
     sample: BiometricSampleDto
 
 
@@ -75,7 +84,7 @@ class TrafficRecordDto(BaseModel):
     bytes_in: int
     bytes_out: int
     connections: int
-    failed_auth: int = Field(alias="failed_auth")
+    failed_auth: int
 
 
 class IDSRequestDto(BaseModel):
@@ -100,11 +109,11 @@ class ModelInfoDto(BaseModel):
     name: str
     algorithm: str
     profile: str
-    size_kb: Optional[float] = Field(default=None, alias="size_kb")
+    size_kb: Optional[float] = None
 
 
 class ModelSummaryDto(BaseModel):
-    active_profile: str = Field(alias="active_profile")
+    active_profile: str
     models: List[ModelInfoDto]
 
 
@@ -196,7 +205,66 @@ class SecurityOverviewResponseDto(BaseModel):
     threat_summary: Dict[str, int]
     recent_events: List[Dict[str, Any]]
     recommendations: List[str]
-    protection_modules: Dict[str, Any] = Field(alias="protection_modules")
+    protection_modules: Dict[str, Any]
+
+
+# Endpoints that need several mock values draw them in one vectorized call. Generator instances
+# are not thread-safe, but these handlers all run on the event loop thread.
+_RNG = np.random.default_rng()
+
+# Static parts of the mock GET responses. Those handlers return ORJSONResponse directly, which
+# FastAPI passes through without re-validating; response_model stays for the OpenAPI schema.
+_MODELS_BODY = {
+    "active_profile": "lite",
+    "models": [
+        {"name": "malware", "algorithm": "NaiveBayes", "profile": "lite", "size_kb": 512.0},
+        {"name": "phishing", "algorithm": "LogReg", "profile": "lite", "size_kb": 256.0},
+        {"name": "anomaly", "algorithm": "IsolationForest", "profile": "lite", "size_kb": 384.0},
+    ],
+}
+_RUNNING_APPS = [
+    {"package": "com.chat.app", "name": "Chat", "memory": 245.2, "importance": "foreground"},
+    {"package": "com.video.app", "name": "Video", "memory": 512.6, "importance": "background"},
+]
+_MEMORY_TIPS = ["Close heavy apps", "Clear cache", "Disable animations"]
+_MODELS_JSON = orjson.dumps(_MODELS_BODY)
+_THERMAL_TEMPS = (32.5, 35.1, 37.0, 39.3)
+_COOLING_RECOMMENDATIONS = ["Avoid direct sunlight", "Close intensive apps"]
+_HOT_COOLING_RECOMMENDATIONS = _COOLING_RECOMMENDATIONS + ["Enable cooling measures"]
+_CURRENT_NETWORK = {"type": "WIFI", "ssid": "GuardixNet", "ip_address": "192.168.1.100", "signal_strength": "-60 dBm"}
+_TOP_NETWORK_APPS = [
+    {"name": "YouTube", "package": "com.google.android.youtube", "download": 1.2, "upload": 0.02},
+    {"name": "Chrome", "package": "com.android.chrome", "download": 0.45, "upload": 0.05},
+    {"name": "Spotify", "package": "com.spotify.music", "download": 0.22, "upload": 0.01},
+]
+_CONNECTION_QUALITIES = ("excellent", "good", "fair")  # keep values aligned with UI expectations
+_SCAN_COMPLETED_EVENT = {"id": "evt1", "type": "scan_completed", "severity": "low", "source": "scanner", "timestamp": ""}
+_SECURITY_OVERVIEW_TEMPLATE = {
+    "security_score": 0,
+    "threat_summary": {},
+    "recent_events": [],
+    "recommendations": ["Enable 2FA", "Review app permissions", "Keep OS updated"],
+    "protection_modules": {
+        "firewall": {"status": "active"},
+        "realtime_protection": {"status": "active"},
+        "web_protection": {"status": "active"},
+    },
+}
+
+
+def _etag(body: bytes) -> str:
+    return '"%s"' % hashlib.md5(body, usedforsecurity=False).hexdigest()
+
+
+_MODELS_ETAG = _etag(_MODELS_JSON)
+
+
+def _cached_json(request: Request, body: bytes, etag: str, max_age: int) -> Response:
+    # Answer a matching If-None-Match with an empty 304 so polling clients skip the body entirely
+    headers = {"ETag": etag, "Cache-Control": f"max-age={max_age}"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 def _ok_token_header(authorization: Optional[str]) -> bool:
@@ -204,10 +272,26 @@ def _ok_token_header(authorization: Optional[str]) -> bool:
     return authorization is None or authorization.startswith("Bearer ")
 
 
+_RISKY_PERMS = frozenset({"READ_SMS", "RECEIVE_SMS", "SYSTEM_ALERT_WINDOW", "WRITE_SETTINGS", "READ_CONTACTS"})
+_RISKY_APIS = frozenset({"exec", "sendtextmessage", "dexclassloader"})  # lowercased
+
+# One case-insensitive pass over the text; no indicator overlaps or contains another, so the
+# set of distinct matches equals the old "which indicators occur as substrings" count
+_PHISH_INDICATORS = ("login", "password", "verify", "bank", "urgent", "suspend", "click here", "update")
+_PHISH_RX = re.compile("|".join(map(re.escape, _PHISH_INDICATORS)), re.IGNORECASE)
+
+
+def _variance_score(arr: List[float]) -> float:
+    if not arr:
+        return 0.0
+    var = float(np.asarray(arr, dtype=np.float32).var())
+    return max(0.0, 1.0 - min(var / 10.0, 1.0))
+
+
 @router.post("/auth/login", response_model=TokenResponseDto)
 async def login(request: TokenRequestDto):
     token = f"demo_{request.user_id}_{int(datetime.now().timestamp())}"
-    return TokenResponseDto(access_token=token, token_type="bearer")
+    return TokenResponseDto.model_construct(access_token=token, token_type="bearer")
 
 
 @router.post("/scan/apk", response_model=ApkScanResponseDto)
@@ -218,14 +302,13 @@ async def scan_apk(request: ApkScanRequestDto, authorization: Optional[str] = He
 
     # Simple heuristic classification based on features
     score = 0.1
-    risky_perms = {"READ_SMS", "RECEIVE_SMS", "SYSTEM_ALERT_WINDOW", "WRITE_SETTINGS", "READ_CONTACTS"}
-    score += 0.2 * sum(1 for p in request.features.permissions if p in risky_perms)
-    score += 0.1 * len([a for a in request.features.api_calls if a.lower() in ("exec", "sendtextmessage", "dexclassloader")])
+    score += 0.2 * sum(1 for p in request.features.permissions if p in _RISKY_PERMS)
+    score += 0.1 * sum(1 for a in request.features.api_calls if a.lower() in _RISKY_APIS)
     score = min(score, 0.99)
     label = "safe" if score < 0.4 else ("suspicious" if score < 0.7 else "malicious")
-    resp = ApkScanResponseDto(
-        scan_id=f"apk_{random.randint(1000, 999999)}",
-        classification=ScanClassificationDto(label=label, probability=float(round(max(score, 1 - score), 3))),
+    resp = ApkScanResponseDto.model_construct(
+        scan_id=f"apk_{secrets.token_hex(4)}",
+        classification=ScanClassificationDto.model_construct(label=label, probability=float(round(max(score, 1 - score), 3))),
         timestamp=datetime.now().isoformat()
     )
     return resp
@@ -234,12 +317,11 @@ async def scan_apk(request: ApkScanRequestDto, authorization: Optional[str] = He
 @router.post("/scan/phishing", response_model=PhishingScanResponseDto)
 async def scan_phishing(request: PhishingScanRequestDto, authorization: Optional[str] = Header(default=None, alias="Authorization")):
     txt = (request.url or "") + " " + (request.text or "")
-    indicators = ["login", "password", "verify", "bank", "urgent", "suspend", "click here", "update"]
-    hits = sum(1 for w in indicators if w in txt.lower())
+    hits = len({m.group().lower() for m in _PHISH_RX.finditer(txt)})
     probability = min(0.1 + 0.15 * hits, 0.98)
     is_phishing = probability >= 0.6
-    return PhishingScanResponseDto(
-        scan_id=f"ph_{random.randint(1000, 999999)}",
+    return PhishingScanResponseDto.model_construct(
+        scan_id=f"ph_{secrets.token_hex(4)}",
         probability=float(round(probability, 3)),
         is_phishing=is_phishing,
         timestamp=datetime.now().isoformat()
@@ -249,21 +331,14 @@ async def scan_phishing(request: PhishingScanRequestDto, authorization: Optional
 @router.post("/auth/biometric", response_model=BiometricAuthResponseDto)
 async def biometric_auth(request: BiometricAuthRequestDto, authorization: Optional[str] = Header(default=None, alias="Authorization")):
     # Simple similarity score: lower variance assumed closer to profile
-    def _score(arr: List[float]) -> float:
-        if not arr:
-            return 0.0
-        avg = sum(arr) / len(arr)
-        var = sum((x - avg) ** 2 for x in arr) / len(arr)
-        return max(0.0, 1.0 - min(var / 10.0, 1.0))
-
     parts = [
-        _score(request.sample.keystroke_timings),
-        _score(request.sample.touch_pressure),
-        _score(request.sample.touch_intervals),
+        _variance_score(request.sample.keystroke_timings),
+        _variance_score(request.sample.touch_pressure),
+        _variance_score(request.sample.touch_intervals),
     ]
     probability = float(round(sum(parts) / 3.0, 3))
     threshold = 0.6
-    return BiometricAuthResponseDto(
+    return BiometricAuthResponseDto.model_construct(
         match=probability >= threshold,
         probability=probability,
         threshold=threshold,
@@ -273,44 +348,36 @@ async def biometric_auth(request: BiometricAuthRequestDto, authorization: Option
 
 @router.post("/monitor/ids", response_model=IDSResponseDto)
 async def monitor_ids(request: IDSRequestDto, authorization: Optional[str] = Header(default=None, alias="Authorization")):
-    anomalies: List[IDSAnomalyDto] = []
-    total_score = 0.0
-    for idx, rec in enumerate(request.traffic):
-        score = 0.0
-        if rec.failed_auth > 3:
-            score += 0.4
-        if rec.connections > 100:
-            score += 0.3
-        if rec.bytes_out > 10_000_000:
-            score += 0.3
-        total_score += score
-        if score >= 0.5:
-            anomalies.append(IDSAnomalyDto(index=idx, score=float(round(score, 3)), record=rec))
-    alert = any(a.score >= 0.7 for a in anomalies)
-    avg_score = float(round(total_score / max(1, len(request.traffic)), 3))
-    return IDSResponseDto(anomalies=anomalies, alert=alert, score=avg_score, timestamp=datetime.now().isoformat())
+    traffic = request.traffic
+    n = len(traffic)
+    failed_auth = np.fromiter((r.failed_auth for r in traffic), dtype=np.int64, count=n)
+    connections = np.fromiter((r.connections for r in traffic), dtype=np.int64, count=n)
+    bytes_out = np.fromiter((r.bytes_out for r in traffic), dtype=np.int64, count=n)
+    scores = 0.4 * (failed_auth > 3) + 0.3 * (connections > 100) + 0.3 * (bytes_out > 10_000_000)
+    anomalies = [
+        IDSAnomalyDto.model_construct(index=int(idx), score=float(round(scores[idx], 3)), record=traffic[idx])
+        for idx in np.flatnonzero(scores >= 0.5)
+    ]
+    alert = bool((scores >= 0.7).any())
+    avg_score = float(round(scores.sum() / max(1, n), 3))
+    return IDSResponseDto.model_construct(anomalies=anomalies, alert=alert, score=avg_score, timestamp=datetime.now().isoformat())
 
 
 @router.get("/models/", response_model=ModelSummaryDto)
-async def models(authorization: Optional[str] = Header(default=None, alias="Authorization")):
-    return ModelSummaryDto(
-        active_profile="lite",
-        models=[
-            ModelInfoDto(name="malware", algorithm="NaiveBayes", profile="lite", size_kb=512.0),
-            ModelInfoDto(name="phishing", algorithm="LogReg", profile="lite", size_kb=256.0),
-            ModelInfoDto(name="anomaly", algorithm="IsolationForest", profile="lite", size_kb=384.0),
-        ],
-    )
+async def models(request: Request, authorization: Optional[str] = Header(default=None, alias="Authorization")):
+    return _cached_json(request, _MODELS_JSON, _MODELS_ETAG, max_age=60)
 
 
 @router.post("/performance/one-tap", response_model=PerformanceOptimizeResponseDto)
 async def performance_optimize(request: PerformanceOptimizeRequestDto, authorization: Optional[str] = Header(default=None, alias="Authorization")):
-    return PerformanceOptimizeResponseDto(
+    memory_freed, storage_freed = _RNG.uniform((100.0, 200.0), (500.0, 1500.0)).tolist()
+    apps_optimized, battery_gain = _RNG.integers((3, 5), (12, 20), endpoint=True).tolist()
+    return PerformanceOptimizeResponseDto.model_construct(
         success=True,
-        memory_freed=round(random.uniform(100.0, 500.0), 2),
-        storage_freed=round(random.uniform(200.0, 1500.0), 2),
-        apps_optimized=random.randint(3, 12),
-        battery_life_improvement=random.randint(5, 20),
+        memory_freed=round(memory_freed, 2),
+        storage_freed=round(storage_freed, 2),
+        apps_optimized=apps_optimized,
+        battery_life_improvement=battery_gain,
         optimization_time="3s",
         recommendations=[
             "Close unused apps",
@@ -326,46 +393,48 @@ async def performance_memory(authorization: Optional[str] = Header(default=None,
     used = round(random.uniform(1200.0, 3200.0), 1)
     avail = round(total - used, 1)
     percent = round((used / total) * 100.0, 1)
-    return MemoryStatusResponseDto(
-        total_ram=total,
-        available_ram=avail,
-        used_ram=used,
-        usage_percent=percent,
-        running_apps=[
-            RunningAppDto(package="com.chat.app", name="Chat", memory=245.2, importance="foreground"),
-            RunningAppDto(package="com.video.app", name="Video", memory=512.6, importance="background"),
-        ],
-        optimization_tips=["Close heavy apps", "Clear cache", "Disable animations"],
-    )
+    return ORJSONResponse({
+        "total_ram": total,
+        "available_ram": avail,
+        "used_ram": used,
+        "usage_percent": percent,
+        "running_apps": _RUNNING_APPS,
+        "optimization_tips": _MEMORY_TIPS,
+    })
+
+
+@lru_cache(maxsize=1)
+def _thermal_snapshot(second: int):
+    # One reading per wall-clock second, shared by every request in that second
+    t = random.choice(_THERMAL_TEMPS)
+    state = "normal" if t < 36 else ("warm" if t < 38.5 else "hot")
+    recs = _HOT_COOLING_RECOMMENDATIONS if state == "hot" else _COOLING_RECOMMENDATIONS
+    body = orjson.dumps({"temperature": t, "thermal_state": state, "cooling_recommendations": recs})
+    return body, _etag(body)
 
 
 @router.get("/performance/thermal", response_model=ThermalStatusResponseDto)
-async def performance_thermal(authorization: Optional[str] = Header(default=None, alias="Authorization")):
-    temps = [32.5, 35.1, 37.0, 39.3]
-    t = random.choice(temps)
-    state = "normal" if t < 36 else ("warm" if t < 38.5 else "hot")
-    recs = ["Avoid direct sunlight", "Close intensive apps"]
-    if state == "hot":
-        recs.append("Enable cooling measures")
-    return ThermalStatusResponseDto(temperature=t, thermal_state=state, cooling_recommendations=recs)
+async def performance_thermal(request: Request, authorization: Optional[str] = Header(default=None, alias="Authorization")):
+    body, etag = _thermal_snapshot(int(time.time()))
+    return _cached_json(request, body, etag, max_age=1)
 
 
 @router.get("/network-tools/usage", response_model=NetworkUsageResponseDto)
 async def network_usage(authorization: Optional[str] = Header(default=None, alias="Authorization")):
-    current = NetworkInfoDto(type="WIFI", ssid="GuardixNet", ip_address="192.168.1.100", signal_strength="-60 dBm")
-    stats = NetworkUsageStatsDto(
-        download_today=round(random.uniform(0.2, 3.5), 2),
-        upload_today=round(random.uniform(0.05, 0.8), 2),
-        download_speed=round(random.uniform(10.0, 120.0), 1),
-        upload_speed=round(random.uniform(2.0, 40.0), 1),
-    )
-    apps = [
-        NetworkAppUsageDto(name="YouTube", package="com.google.android.youtube", download=1.2, upload=0.02),
-        NetworkAppUsageDto(name="Chrome", package="com.android.chrome", download=0.45, upload=0.05),
-        NetworkAppUsageDto(name="Spotify", package="com.spotify.music", download=0.22, upload=0.01),
-    ]
-    quality = random.choice(["excellent", "good", "fair"])  # keep values aligned with UI expectations
-    return NetworkUsageResponseDto(current_network=current, usage_stats=stats, top_apps=apps, connection_quality=quality)
+    down_today, up_today, down_speed, up_speed = _RNG.uniform((0.2, 0.05, 10.0, 2.0), (3.5, 0.8, 120.0, 40.0)).tolist()
+    stats = {
+        "download_today": round(down_today, 2),
+        "upload_today": round(up_today, 2),
+        "download_speed": round(down_speed, 1),
+        "upload_speed": round(up_speed, 1),
+    }
+    quality = random.choice(_CONNECTION_QUALITIES)
+    return ORJSONResponse({
+        "current_network": _CURRENT_NETWORK,
+        "usage_stats": stats,
+        "top_apps": _TOP_NETWORK_APPS,
+        "connection_quality": quality,
+    })
 
 
 @router.get("/storage/storage-overview", response_model=StorageOverviewResponseDto)
@@ -374,44 +443,41 @@ async def storage_overview(authorization: Optional[str] = Header(default=None, a
     used = round(random.uniform(20_000.0, 96_000.0), 1)
     avail = round(total - used, 1)
     percent = round((used / total) * 100.0, 1)
-    return StorageOverviewResponseDto(total_storage=total, used_storage=used, available_storage=avail, usage_percentage=percent)
+    return ORJSONResponse({"total_storage": total, "used_storage": used, "available_storage": avail, "usage_percentage": percent})
 
 
-@router.post("/anomaly/behavior", response_model=AnomalyResponseDto)
-async def anomaly_behavior(request: AnomalyRequestDto, authorization: Optional[str] = Header(default=None, alias="Authorization")):
+def _score_anomaly(xs: List[float]) -> AnomalyResponseDto:
     # Simple anomaly score (mock): higher variance => higher anomaly score
-    xs = request.metrics
     if not xs:
-        return AnomalyResponseDto(label="normal", score=0.05, probability=0.95)
-    avg = sum(xs) / len(xs)
-    var = sum((x - avg) ** 2 for x in xs) / len(xs)
-    score = float(min(1.0, var / 10.0))
+        return AnomalyResponseDto.model_construct(label="normal", score=0.05, probability=0.95)
+    var = float(np.asarray(xs, dtype=np.float32).var())
+    score = min(1.0, var / 10.0)
     label = "anomaly" if score > 0.6 else "normal"
-    prob = float(round(0.5 + abs(score - 0.5), 3))
-    return AnomalyResponseDto(label=label, score=float(round(score, 3)), probability=prob)
+    prob = round(0.5 + abs(score - 0.5), 3)
+    return AnomalyResponseDto.model_construct(label=label, score=round(score, 3), probability=prob)
+
+
+@router.post("/anomaly/behavior", response_model=AnomalyResponseDto)
+async def anomaly_behavior(request: AnomalyRequestDto, authorization: Optional[str] = Header(default=None, alias="Authorization")):
+    return _score_anomaly(request.metrics)
 
 
 @router.post("/anomaly/system", response_model=AnomalyResponseDto)
 async def anomaly_system(request: AnomalyRequestDto, authorization: Optional[str] = Header(default=None, alias="Authorization")):
     # Same mock logic for system
-    return await anomaly_behavior(request, authorization)
+    return _score_anomaly(request.metrics)
 
 
 @router.get("/security-tools/overview", response_model=SecurityOverviewResponseDto)
 async def security_overview(authorization: Optional[str] = Header(default=None, alias="Authorization")):
-    return SecurityOverviewResponseDto(
-        security_score=random.randint(70, 95),
-        threat_summary={"malware": random.randint(0, 3), "phishing": random.randint(0, 2), "network": random.randint(0, 4)},
-        recent_events=[
-            {"id": "evt1", "type": "scan_completed", "severity": "low", "source": "scanner", "timestamp": datetime.now().isoformat()},
-        ],
-        recommendations=["Enable 2FA", "Review app permissions", "Keep OS updated"],
-        protection_modules={
-            "firewall": {"status": "active"},
-            "realtime_protection": {"status": "active"},
-            "web_protection": {"status": "active"},
-        },
-    )
+    score, malware, phishing, network = _RNG.integers((70, 0, 0, 0), (95, 3, 2, 4), endpoint=True).tolist()
+    # Patch only the per-request fields; unpacking keeps the template's key order
+    return ORJSONResponse({
+        **_SECURITY_OVERVIEW_TEMPLATE,
+        "security_score": score,
+        "threat_summary": {"malware": malware, "phishing": phishing, "network": network},
+        "recent_events": [{**_SCAN_COMPLETED_EVENT, "timestamp": datetime.now().isoformat()}],
+    })
 
 
 # Expose router as public_router for main.py
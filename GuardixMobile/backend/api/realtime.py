@@ -1,54 +1,65 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from datetime import datetime
+from typing import Dict, Optional
 import asyncio
+import orjson
 import psutil
 import random
+import secrets
+import time
 
 realtime_router = APIRouter()
 
+# Fixed for the life of the process; no need to ask psutil every tick
+_CPU_LOGICAL = psutil.cpu_count() or 4
+_CPU_PHYSICAL = psutil.cpu_count(logical=False) or 2
 
-def _system_metrics_payload():
+
+# Payload builders take the tick's timestamp as a datetime; orjson formats it in C with the same
+# ISO-8601 output as isoformat(), so one datetime.now() covers every field of a tick. psutil
+# already hands back plain ints and floats, so values go into the payload as-is.
+def _system_metrics_payload(now: datetime):
     vm = psutil.virtual_memory()
     disk = psutil.disk_usage("/")
     net_io = psutil.net_io_counters()
     cpu_percent = psutil.cpu_percent(interval=None)
     return {
         "type": "system_metrics",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now,
         "data": {
             "cpu": {
-                "usage_percent": float(cpu_percent),
-                "cores": psutil.cpu_count() or 4,
-                "physical_cores": psutil.cpu_count(logical=False) or 2,
+                "usage_percent": cpu_percent,
+                "cores": _CPU_LOGICAL,
+                "physical_cores": _CPU_PHYSICAL,
             },
             "memory": {
-                "total": int(vm.total // (1024 * 1024)),
-                "available": int(vm.available // (1024 * 1024)),
-                "used": int(vm.used // (1024 * 1024)),
-                "percent": float(vm.percent),
+                "total": vm.total // (1024 * 1024),
+                "available": vm.available // (1024 * 1024),
+                "used": vm.used // (1024 * 1024),
+                "percent": vm.percent,
             },
             "disk": {
-                "total": int(disk.total // (1024 * 1024)),
-                "used": int(disk.used // (1024 * 1024)),
-                "free": int(disk.free // (1024 * 1024)),
-                "percent": float(disk.percent),
+                "total": disk.total // (1024 * 1024),
+                "used": disk.used // (1024 * 1024),
+                "free": disk.free // (1024 * 1024),
+                "percent": disk.percent,
             },
             "network": {
-                "bytes_sent": int(net_io.bytes_sent),
-                "bytes_recv": int(net_io.bytes_recv),
-                "packets_sent": int(net_io.packets_sent),
-                "packets_recv": int(net_io.packets_recv),
+                "bytes_sent": net_io.bytes_sent,
+                "bytes_recv": net_io.bytes_recv,
+                "packets_sent": net_io.packets_sent,
+                "packets_recv": net_io.packets_recv,
             },
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now,
         },
     }
 
 
-def _network_status_payload():
+def _network_status_payload(now: datetime):
     # Minimal mock data; building actual interfaces list cross-platform is non-trivial
     return {
         "type": "network_status",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now,
         "data": {
             "hostname": "guardix-local",
             "interfaces": [
@@ -71,48 +82,56 @@ def _network_status_payload():
                 "download_mbps": round(random.uniform(5.0, 120.0), 1),
                 "upload_mbps": round(random.uniform(1.0, 40.0), 1),
             },
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now,
         },
     }
 
 
-def _security_events_payload():
+def _security_events_payload(now: datetime):
     return {
         "type": "security_events",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now,
         "data": {
             "events": [
                 {
-                    "id": f"evt_{random.randint(1000,9999)}",
+                    "id": f"evt_{secrets.token_hex(4)}",
                     "type": random.choice(["scan_completed", "threat_blocked", "anomaly_detected"]),
                     "severity": random.choice(["low", "medium", "high"]),
                     "source": random.choice(["scanner", "network", "monitor"]),
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": now,
                 }
             ],
             "total_count": random.randint(1, 500),
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now,
         },
     }
 
 
-def _process_list_payload():
+def _process_list_payload(now: datetime):
     # Limit to a few processes for payload size
     procs = []
     count = 0
-    for p in psutil.process_iter(attrs=["pid", "name", "username"]):
+    # No attrs: process_iter would otherwise read them for every process on the host, but only
+    # five rows are used. oneshot() batches each row's /proc reads.
+    for p in psutil.process_iter():
         if count >= 5:
             break
         try:
-            cpu = p.cpu_percent(interval=None) / max(1, psutil.cpu_count())
-            mem = p.memory_percent()
+            with p.oneshot():
+                name = p.name()
+                try:
+                    username = p.username()
+                except psutil.AccessDenied:
+                    username = None
+                cpu = p.cpu_percent(interval=None) / _CPU_LOGICAL
+                mem = p.memory_percent()
             procs.append(
                 {
-                    "pid": p.info.get("pid", 0),
-                    "name": p.info.get("name", "proc"),
-                    "username": p.info.get("username", "user"),
-                    "cpu_percent": round(float(cpu), 2),
-                    "memory_percent": round(float(mem), 2),
+                    "pid": p.pid,
+                    "name": name,
+                    "username": username,
+                    "cpu_percent": round(cpu, 2),
+                    "memory_percent": round(mem, 2),
                 }
             )
             count += 1
@@ -120,18 +139,60 @@ def _process_list_payload():
             continue
     return {
         "type": "process_list",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now,
         "data": {
             "processes": procs,
             "total_count": len(procs),
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now,
         },
     }
 
 
-async def _send_safe(ws: WebSocket, payload: dict) -> bool:
+# One producer builds every payload once per tick and all connections send the same
+# pre-serialized text, so psutil and serialization cost don't grow with the client count.
+_TICK_SECONDS = 1.0
+_PAYLOAD_BUILDERS = (
+    ("system_metrics", _system_metrics_payload),
+    ("network_status", _network_status_payload),
+    ("security_events", _security_events_payload),
+    ("process_list", _process_list_payload),
+)
+_latest: Dict[str, str] = {}
+_latest_at = float("-inf")  # time.monotonic() of the last refresh
+_tick = asyncio.Event()
+_subscribers = 0
+_producer: Optional[asyncio.Task] = None
+
+
+def _refresh_payloads(now: datetime) -> None:
+    global _latest_at
+    _latest_at = time.monotonic()
+    for name, build in _PAYLOAD_BUILDERS:
+        _latest[name] = orjson.dumps(build(now)).decode()
+
+
+async def _producer_loop() -> None:
+    global _tick
+    while True:
+        await asyncio.sleep(_TICK_SECONDS)
+        if _subscribers:
+            _refresh_payloads(datetime.now())
+            # Wake everyone waiting on this tick; later waiters get the next one
+            tick, _tick = _tick, asyncio.Event()
+            tick.set()
+
+
+def _ensure_producer() -> None:
+    # Started lazily so it always runs on the serving loop
+    global _producer
+    if _producer is None or _producer.done():
+        _producer = asyncio.create_task(_producer_loop())
+
+
+async def _send_safe(ws: WebSocket, text: str) -> bool:
     try:
-        await ws.send_json(payload)
+        # Text frames, since the app only handles onMessage(text)
+        await ws.send_text(text)
         return True
     except Exception:
         return False
@@ -139,24 +200,30 @@ async def _send_safe(ws: WebSocket, payload: dict) -> bool:
 
 @realtime_router.websocket("/realtime/ws")
 async def realtime_ws(websocket: WebSocket):
+    global _subscribers
     await websocket.accept()
+    _ensure_producer()
+    _subscribers += 1
     try:
-        # Send an initial burst of messages
-        for _ in range(3):
-            if not (_send := await _send_safe(websocket, _system_metrics_payload())):
-                break
-            if not (_send := await _send_safe(websocket, _network_status_payload())):
-                break
-            if not (_send := await _send_safe(websocket, _security_events_payload())):
-                break
-            if not (_send := await _send_safe(websocket, _process_list_payload())):
-                break
-            await asyncio.sleep(1.0)
+        # The producer idles without subscribers, so a connection after a quiet spell
+        # would otherwise start from payloads of the previous session
+        if time.monotonic() - _latest_at >= _TICK_SECONDS:
+            _refresh_payloads(datetime.now())
+        # Send an initial burst of messages, one round per tick
+        for round_ in range(3):
+            if round_:
+                await _tick.wait()
+            for name, _ in _PAYLOAD_BUILDERS:
+                if not await _send_safe(websocket, _latest[name]):
+                    return
 
-        # Keep streaming system metrics periodically
+        # Keep streaming system metrics periodically: one tick after the burst, then every two
         while True:
-            if not await _send_safe(websocket, _system_metrics_payload()):
+            await _tick.wait()
+            if not await _send_safe(websocket, _latest["system_metrics"]):
                 break
-            await asyncio.sleep(2.0)
+            await _tick.wait()
     except WebSocketDisconnect:
         return
+    finally:
+        _subscribers -= 1
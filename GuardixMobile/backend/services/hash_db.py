@@ -0,0 +1,35 @@
+import bisect
+import mmap
+from struct import Struct
+from typing import Optional
+
+# One fixed-stride record per known-bad file, sorted by digest: SHA-256, severity code, flags
+RECORD = Struct("<32sBI")
+SEVERITIES = ("low", "medium", "high")
+
+
+class HashDB:
+    """Packed SHA-256 blocklist (see tools/pack_sigs.py), memory-mapped rather than parsed: opening
+    it is O(1), and every process scanning with it shares the same page-cache pages."""
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as f:
+            size = f.seek(0, 2)
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._count = len(self._mm) // RECORD.size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> bytes:
+        # Digest column only, so bisect compares 32-byte keys
+        offset = i * RECORD.size
+        return self._mm[offset:offset + 32]
+
+    def lookup(self, digest: bytes) -> Optional[str]:
+        """Severity of a blocklisted digest, or None."""
+        i = bisect.bisect_left(self, digest)
+        if i == self._count or self[i] != digest:
+            return None
+        _, severity, _ = RECORD.unpack_from(self._mm, i * RECORD.size)
+        return SEVERITIES[min(severity, len(SEVERITIES) - 1)]
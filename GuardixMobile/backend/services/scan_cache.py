@@ -0,0 +1,54 @@
+import orjson
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+
+_SCHEMA_VERSION = 2
+
+
+class ScanCache:
+    """On-disk verdicts per file, valid while the file's (dev, ino, mtime_ns, size) and the
+    signature DB version are unchanged, so repeat scans only stat unchanged files. Rows also
+    carry the content SHA-256 fingerprint."""
+
+    def __init__(self, path: str) -> None:
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Scans run in worker threads; one shared connection, serialized by the lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            # It is only a cache: on a layout change, start over rather than migrate
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+                self._conn.execute("DROP TABLE IF EXISTS verdicts")
+                self._conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS verdicts ("
+                "path TEXT PRIMARY KEY, dev INTEGER, ino INTEGER, mtime_ns INTEGER, size INTEGER, "
+                "sha256 TEXT, sig_version TEXT, verdict TEXT)"
+            )
+
+    def get(self, path: str, st: os.stat_result, sig_version: str) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT dev, ino, mtime_ns, size, sig_version, verdict FROM verdicts WHERE path = ?", (path,)
+            ).fetchone()
+        if row is None or row[:5] != (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size, sig_version):
+            return None
+        return orjson.loads(row[5])
+
+    def put(
+        self, path: str, st: os.stat_result, sha256: str, verdict: List[Dict[str, Any]], sig_version: str
+    ) -> None:
+        # Not committed here; callers commit() once per scan
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (path, st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size, sha256, sig_version, orjson.dumps(verdict)),
+            )
+
+    def commit(self) -> None:
+        with self._lock:
+            self._conn.commit()
@@ -1,31 +1,253 @@
+import asyncio
+import hashlib
+import mmap
+import multiprocessing
+import os
 import random
-from typing import List, Dict, Any
+import re
+import stat
+import time
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from services.hash_db import HashDB
+from services.scan_cache import ScanCache
+
+# Byte signatures: (signature id, pattern, severity)
+_SIGNATURES = (
+    ("GEN.MLW.001", b"GUARDIX-TEST-MALWARE-SIGNATURE", "high"),
+    ("AND.ROOT.EXPLOIT", b"/data/local/tmp/rootshell", "high"),
+    ("AND.SPY.KEYLOG", b"KeyloggerAccessibilityService", "high"),
+)
+# All signatures compiled into one alternation, once, so each file is matched in a single pass
+# over its bytes instead of once per signature
+_SIGNATURE_RX = re.compile(b"|".join(re.escape(pattern) for _, pattern, _ in _SIGNATURES))
+# Linux: fault the whole file in with one call instead of a page fault per 4 KiB
+if hasattr(mmap, "MAP_POPULATE"):
+    _MAP_ARGS = {"flags": mmap.MAP_SHARED | mmap.MAP_POPULATE, "prot": mmap.PROT_READ}
+else:
+    _MAP_ARGS = {"access": mmap.ACCESS_READ}
+# Pool workers start from a clean interpreter rather than a fork of the serving process and
+# its threads; forkserver where the platform has it (it forks from a single-threaded server)
+_MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+# Seconds a finished full_scan result is served to repeat callers (the dashboard polls every few seconds)
+_FULL_SCAN_TTL = 2.0
+_DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "guardix", "scan_cache.db")
+# Packed SHA-256 blocklist built by tools/pack_sigs.py; optional
+_DEFAULT_HASH_DB = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "signatures", "sigs.bin")
+
+# Sample results, built once. Scans return new lists over these shared dicts; callers treat
+# them as read-only (they are only serialized)
+_QUICK_SAMPLE = (
+    {"type": "tracking_sdk", "package": "com.ads.sdk", "severity": "low"},
+    {"type": "permission_overuse", "package": "com.example.app", "severity": "medium"},
+)
+_FULL_SAMPLE = (
+    {"type": "risk_app", "package": "com.unknown.app", "severity": "medium"},
+    {"type": "suspicious_behavior", "process": "sh", "severity": "high"},
+)
+_MALWARE_SAMPLE = (
+    {"signature": "GEN.MLW.001", "file": "/storage/app/base.apk", "severity": "high"},
+)
+_PRIVACY_SAMPLE = (
+    {"issue": "camera_background_access", "app": "com.camera.app"},
+    {"issue": "contacts_access", "app": "com.social.app"},
+)
+
+
+def _iter_files(roots: Iterable[str]) -> Iterator[str]:
+    for root in roots:
+        if os.path.isfile(root):
+            yield root
+            continue
+        for dirpath, _, filenames in os.walk(root):
+            for name in filenames:
+                yield os.path.join(dirpath, name)
+
+
+@contextmanager
+def _mapped(path: str) -> Iterator[Union[bytes, mmap.mmap]]:
+    """Read-only view of a file's bytes straight from the page cache, with no copy into Python."""
+    with open(path, "rb", buffering=0) as f:
+        fd = f.fileno()
+        if os.fstat(fd).st_size == 0:
+            yield b""  # mmap rejects empty files
+            return
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        with mmap.mmap(fd, 0, **_MAP_ARGS) as mm:
+            yield mm
+
+
+def _match(data: Union[bytes, mmap.mmap], path: str, digest: str) -> List[Dict[str, Any]]:
+    found = {m.group() for m in _SIGNATURE_RX.finditer(data)}
+    return [
+        {"signature": sig_id, "file": path, "sha256": digest, "severity": severity}
+        for sig_id, pattern, severity in _SIGNATURES
+        if pattern in found
+    ]
+
+
+# Hash DBs opened in this process (each pool worker maps the file once)
+_hash_dbs: Dict[str, HashDB] = {}
+
+
+def _hash_and_match(path: str, hash_db_path: Optional[str]) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+    """Pool worker: hash and match one file through a single mapping."""
+    try:
+        with _mapped(path) as data:
+            # Hashed in C (OpenSSL, SHA extensions where the CPU has them) without the GIL
+            raw = hashlib.sha256(data).digest()
+            digest = raw.hex()
+            hits = _match(data, path, digest)
+    except (OSError, ValueError):
+        return None  # unreadable or vanished mid-scan
+    if hash_db_path:
+        if hash_db_path not in _hash_dbs:
+            _hash_dbs[hash_db_path] = HashDB(hash_db_path)
+        severity = _hash_dbs[hash_db_path].lookup(raw)
+        if severity:
+            hits.append({"signature": "HASH.BLOCKLIST", "file": path, "sha256": digest, "severity": severity})
+    return digest, hits
 
 
 class ThreatDetector:
+    def __init__(
+        self,
+        scan_paths: Optional[Sequence[str]] = None,
+        cache_path: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        hash_db_path: Optional[str] = None,
+    ) -> None:
+        # Files/directories to match against the signatures; GUARDIX_SCAN_PATHS is os.pathsep-separated
+        if scan_paths is None:
+            scan_paths = [p for p in os.environ.get("GUARDIX_SCAN_PATHS", "").split(os.pathsep) if p]
+        self.scan_paths = list(scan_paths)
+        self.cache_path = cache_path or os.environ.get("GUARDIX_SCAN_CACHE", _DEFAULT_CACHE_PATH)
+        # Files scanned at once (and pool processes); bounds open descriptors and disk contention
+        self.max_concurrency = max_concurrency or os.cpu_count() or 4
+        self._cache: Optional[ScanCache] = None
+        hash_db_path = hash_db_path or os.environ.get("GUARDIX_HASH_DB", _DEFAULT_HASH_DB)
+        self.hash_db_path = hash_db_path if os.path.isfile(hash_db_path) else None
+        # Cached verdicts are only reused while the signatures and hash DB they were computed with are unchanged
+        version = repr(_SIGNATURES)
+        if self.hash_db_path:
+            db_stat = os.stat(self.hash_db_path)
+            version += f"{db_stat.st_size}:{db_stat.st_mtime_ns}"
+        self._sig_version = hashlib.sha256(version.encode()).hexdigest()[:16]
+        # re matching holds the GIL, so files are matched in worker processes. Created on the
+        # first file scan, so importing this module or running sample scans never forks.
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # Own generator for the sample results, independent of the module-level random state
+        self._rng = random.Random()
+        # Latest full_scan task, shared while running and for _FULL_SCAN_TTL after it finishes
+        self._full_scan: Optional[asyncio.Task] = None
+        self._full_scan_done = float("-inf")  # time.monotonic() when it finished
+
+    def _cached_verdict(
+        self, cache: ScanCache, path: str, rescan: bool
+    ) -> Tuple[Optional[os.stat_result], Optional[List[Dict[str, Any]]]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None, []
+        if not stat.S_ISREG(st.st_mode):
+            return None, []  # FIFOs, sockets, devices
+        return st, None if rescan else cache.get(path, st, self._sig_version)
+
+    async def _scan_files(self, rescan: bool = False) -> List[Dict[str, Any]]:
+        # Stat, cache and walk I/O runs in threads; hashing and matching run in the process pool
+        if self._cache is None:
+            self._cache = await asyncio.to_thread(ScanCache, self.cache_path)
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_concurrency, mp_context=_MP_CONTEXT)
+        cache, pool = self._cache, self._pool
+        loop = asyncio.get_running_loop()
+        paths = await asyncio.to_thread(lambda: list(_iter_files(self.scan_paths)))
+        sem = asyncio.Semaphore(self.max_concurrency)
+
+        async def scan_one(path: str) -> List[Dict[str, Any]]:
+            async with sem:
+                st, verdict = await asyncio.to_thread(self._cached_verdict, cache, path, rescan)
+                if verdict is not None:
+                    return verdict
+                result = await loop.run_in_executor(pool, _hash_and_match, path, self.hash_db_path)
+                if result is None:
+                    return []
+                digest, verdict = result
+                await asyncio.to_thread(cache.put, path, st, digest, verdict, self._sig_version)
+                return verdict
+
+        verdicts = await asyncio.gather(*(scan_one(path) for path in paths))
+        await asyncio.to_thread(cache.commit)
+        return [hit for verdict in verdicts for hit in verdict]
+
+    def close(self) -> None:
+        """Stop the worker processes; queued file scans are cancelled. A later scan starts a new pool."""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
     async def quick_scan(self) -> List[Dict[str, Any]]:
         # Return a few sample potential risks
-        items = [
-            {"type": "tracking_sdk", "package": "com.ads.sdk", "severity": "low"},
-            {"type": "permission_overuse", "package": "com.example.app", "severity": "medium"},
-        ]
-        return items[: random.randint(0, len(items))]
-
-    async def full_scan(self) -> List[Dict,]:
-        threats = [
-            {"type": "risk_app", "package": "com.unknown.app", "severity": "medium"},
-            {"type": "suspicious_behavior", "process": "sh", "severity": "high"},
-        ]
-        return threats[: random.randint(1, len(threats))]
-
-    async def malware_scan(self) -> List[Dict,]:
-        return [
-            {"signature": "GEN.MLW.001", "file": "/storage/app/base.apk", "severity": "high"}
-        ] if random.random() > 0.6 else []
-
-    async def privacy_audit(self) -> List[Dict,]:
-        return [
-            {"issue": "camera_background_access", "app": "com.camera.app"},
-            {"issue": "contacts_access", "app": "com.social.app"},
-        ]
+        return list(_QUICK_SAMPLE[: self._rng.randrange(len(_QUICK_SAMPLE) + 1)])
+
+    def _sample_threats(self) -> List[Dict[str, Any]]:
+        return list(_FULL_SAMPLE[: self._rng.randrange(1, len(_FULL_SAMPLE) + 1)])
+
+    async def full_scan(self) -> List[Dict[str, Any]]:
+        """Calls made while a scan runs, or within _FULL_SCAN_TTL of it finishing, share that
+        scan, so a burst of dashboard polls costs one walk of scan_paths."""
+        task = self._full_scan
+        if not self._reusable(task):
+            task = self._full_scan = asyncio.ensure_future(self._run_full_scan())
+            task.add_done_callback(self._full_scan_finished)
+        # Shielded: one caller being cancelled must not cancel the scan the others wait on
+        return list(await asyncio.shield(task))
+
+    def _reusable(self, task: Optional[asyncio.Task]) -> bool:
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            return False
+        if not task.done():
+            return True
+        if task.cancelled() or task.exception() is not None:
+            return False
+        return time.monotonic() - self._full_scan_done < _FULL_SCAN_TTL
+
+    def _full_scan_finished(self, task: asyncio.Task) -> None:
+        self._full_scan_done = time.monotonic()
+
+    async def _run_full_scan(self) -> List[Dict[str, Any]]:
+        threats = self._sample_threats()
+        if self.scan_paths:
+            threats += await self.malware_scan()
+        return threats
+
+    async def malware_scan(self, rescan: bool = False) -> List[Dict[str, Any]]:
+        if self.scan_paths:
+            # rescan=True ignores cached verdicts and re-reads every file
+            return await self._scan_files(rescan)
+        # No scan targets configured: keep the sample result
+        return list(_MALWARE_SAMPLE) if self._rng.random() > 0.6 else []
+
+    async def privacy_audit(self) -> List[Dict[str, Any]]:
+        return list(_PRIVACY_SAMPLE)
 
+    async def scan_all(self, rescan: bool = False) -> Dict[str, Any]:
+        """Run every scan concurrently. A failing scan is reported under "errors" rather than
+        failing the others; the file scan runs once and feeds both "full" and "malware"."""
+        names = ("quick", "malware", "privacy")
+        results = await asyncio.gather(
+            self.quick_scan(), self.malware_scan(rescan), self.privacy_audit(), return_exceptions=True
+        )
+        merged: Dict[str, Any] = {"errors": {}}
+        for name, result in zip(names, results):
+            if isinstance(result, BaseException):
+                merged["errors"][name] = str(result)
+                result = []
+            merged[name] = result
+        merged["full"] = self._sample_threats() + (merged["malware"] if self.scan_paths else [])
+        return merged
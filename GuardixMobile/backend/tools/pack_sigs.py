@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Pack a SHA-256 blocklist into the fixed-stride binary read by services.hash_db.HashDB.
+
+Input: one "<sha256 hex> [low|medium|high]" per line (default severity high); blank lines and
+lines starting with # are ignored. Run from GuardixMobile/backend:
+
+    python tools/pack_sigs.py hashes.txt signatures/sigs.bin
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.hash_db import RECORD, SEVERITIES  # noqa: E402
+
+
+def read_entries(path):
+    entries = {}
+    with open(path, encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            fields = line.split("#", 1)[0].split()
+            if not fields:
+                continue
+            try:
+                digest = bytes.fromhex(fields[0])
+                severity = SEVERITIES.index(fields[1].lower()) if len(fields) > 1 else len(SEVERITIES) - 1
+            except ValueError:
+                sys.exit(f"{path}:{lineno}: expected '<sha256 hex> [{'|'.join(SEVERITIES)}]'")
+            if len(digest) != 32:
+                sys.exit(f"{path}:{lineno}: not a SHA-256 digest")
+            entries[digest] = max(severity, entries.get(digest, 0))
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("source", help="text file of SHA-256 digests")
+    parser.add_argument("output", help="packed signature file to write")
+    args = parser.parse_args()
+
+    entries = read_entries(args.source)
+    buf = bytearray(RECORD.size * len(entries))
+    # Sorted so HashDB can bisect the digest column
+    for i, digest in enumerate(sorted(entries)):
+        RECORD.pack_into(buf, i * RECORD.size, digest, entries[digest], 0)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "wb") as f:
+        f.write(buf)
+    print(f"Packed {len(entries)} signatures into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
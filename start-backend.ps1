@@ -24,7 +24,7 @@ try {
     $pythonVersion = python --version 2>&1
     Write-Host "✅ Python found: $pythonVersion" -ForegroundColor Green
 } catch {
-    Write-Host "❌ Python not found! Please install Python 3.8+" -ForegroundColor Red
+    Write-Host "❌ Python not found! Please install Python 3.11+" -ForegroundColor Red
     Write-Host "Download from: https://www.python.org/downloads/" -ForegroundColor Yellow
     exit 1
 }
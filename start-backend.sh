@@ -12,7 +12,7 @@ cd "$(dirname "$0")/GuardixBackend/python" || exit 1
 
 # Check if Python is installed
 if ! command -v python3 &> /dev/null; then
-    echo "❌ Python 3 not found! Please install Python 3.8+"
+    echo "❌ Python 3 not found! Please install Python 3.11+"
     exit 1
 fi
 
@@ -2,14 +2,37 @@
 """
 Guardix Backend Integration Test
 Tests the backend API endpoints to ensure they're working correctly
+
+Run as a script, or as a pytest suite (in parallel with pytest-xdist):
+    pytest -n auto test-integration.py
 """
 
-import requests
-import json
+import asyncio
+import base64
+import httpx
+import orjson
+import sys
+import time
 from datetime import datetime
+from pathlib import Path
+
+try:
+    import pytest
+except ImportError:  # script mode does not need it
+    pytest = None
 
 # Configuration
 BASE_URL = "http://localhost:8000"
+# Tests run after health check and login: (label, method, endpoint, JSON body, (detail label, result key))
+TESTS = [
+    ("Performance API", 'GET', '/performance/memory', None, None),
+    ("Network API", 'GET', '/network-tools/usage', None, None),
+    ("Security API", 'GET', '/security-tools/overview', None, None),
+    ("Storage API", 'GET', '/storage/storage-overview', None, None),
+    ("Anomaly Detection", 'POST', '/anomaly/behavior',
+     {"metrics": [0.5, 0.3, 0.8, 0.2, 0.6]}, ("Anomaly score", 'score')),
+    ("Models API", 'GET', '/models/', None, None),
+]
 COLORS = {
     'GREEN': '\033[92m',
     'RED': '\033[91m',
@@ -17,161 +40,213 @@ COLORS = {
     'BLUE': '\033[94m',
     'END': '\033[0m'
 }
+# (prefix, suffix) per color, built once; no escapes at all when output is piped or redirected
+if sys.stdout.isatty():
+    WRAP = {name: (code, COLORS['END'] + '\n') for name, code in COLORS.items()}
+else:
+    WRAP = {name: ('', '\n') for name in COLORS}
+
+# Body for POST /auth/login; also keys the cached token
+AUTH_DATA = {"user_id": "test-device-001"}
+
+# Login tokens reused across runs until shortly before they expire; pass --login to force a fresh login
+TOKEN_CACHE = Path("~/.cache/guardix-itest.json").expanduser()
+TOKEN_EXPIRY_MARGIN = 30
+
+# Output is collected here and written with one sys.stdout.write per flush_output()
+OUT = []
+
+def emit(text, color='BLUE'):
+    """Queue colored text for the console"""
+    prefix, suffix = WRAP[color]
+    OUT.extend((prefix, text, suffix))
+
+def flush_output():
+    """Write queued output in a single call"""
+    sys.stdout.write(''.join(OUT))
+    sys.stdout.flush()
+    OUT.clear()
 
-def print_colored(text, color='BLUE'):
-    """Print colored text to console"""
-    print(f"{COLORS.get(color, '')}{text}{COLORS['END']}")
+def jwt_expiry(token):
+    """Read a JWT's exp claim without verifying the signature (only used to decide when to log in again)"""
+    try:
+        payload = token.split('.')[1]
+        return float(orjson.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))['exp'])
+    except Exception:
+        return None
+
+def load_cached_token(key):
+    """Return a cached token that is still valid for at least TOKEN_EXPIRY_MARGIN seconds"""
+    try:
+        entry = orjson.loads(TOKEN_CACHE.read_bytes())[key]
+        if entry['exp'] - TOKEN_EXPIRY_MARGIN > time.time():
+            return entry['token']
+    except Exception:
+        pass
+    return None
 
-def test_endpoint(method, endpoint, data=None, headers=None, expected_status=200):
+def save_cached_token(key, token):
+    """Cache a token until its exp claim; tokens without one are not cached"""
+    exp = jwt_expiry(token)
+    if exp is None:
+        return
+    try:
+        cache = orjson.loads(TOKEN_CACHE.read_bytes())
+    except Exception:
+        cache = {}
+    cache[key] = {"token": token, "exp": exp}
+    TOKEN_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    TOKEN_CACHE.write_bytes(orjson.dumps(cache))
+
+async def check_endpoint(client, method, endpoint, data=None, headers=None, expected_status=200):
     """Test a single endpoint"""
-    url = f"{BASE_URL}{endpoint}"
-    
     try:
         if method == 'GET':
-            response = requests.get(url, headers=headers, timeout=5)
+            response = await client.get(endpoint, headers=headers)
         elif method == 'POST':
-            response = requests.post(url, json=data, headers=headers, timeout=5)
+            response = await client.post(endpoint, json=data, headers=headers)
         else:
             return False, f"Unsupported method: {method}"
         
         if response.status_code == expected_status:
-            return True, response.json()
+            return True, orjson.loads(response.content)
         else:
             return False, f"Expected {expected_status}, got {response.status_code}"
     
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         return False, "Connection refused - Is the backend running?"
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         return False, "Request timeout"
     except Exception as e:
         return False, str(e)
 
-def main():
-    print_colored("\n" + "="*60, 'BLUE')
-    print_colored("  Guardix Backend Integration Test", 'BLUE')
-    print_colored("="*60 + "\n", 'BLUE')
+async def main():
+    # One keep-alive client for every request
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=5) as client:
+        try:
+            return await run_tests(client)
+        finally:
+            flush_output()
+
+async def run_tests(client):
+    emit("\n" + "="*60, 'BLUE')
+    emit("  Guardix Backend Integration Test", 'BLUE')
+    emit("="*60 + "\n", 'BLUE')
     
-    print_colored(f"Testing backend at: {BASE_URL}", 'YELLOW')
-    print_colored(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n", 'YELLOW')
+    emit(f"Testing backend at: {BASE_URL}", 'YELLOW')
+    emit(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n", 'YELLOW')
     
     tests_passed = 0
     tests_failed = 0
     
     # Test 1: Health Check
-    print_colored("1. Testing Health Check (GET /)", 'BLUE')
-    success, result = test_endpoint('GET', '/')
+    emit("1. Testing Health Check (GET /)", 'BLUE')
+    success, result = await check_endpoint(client, 'GET', '/')
     if success:
-        print_colored(f"   ✅ PASSED - {result.get('message', 'OK')}", 'GREEN')
+        emit(f"   ✅ PASSED - {result.get('message', 'OK')}", 'GREEN')
         tests_passed += 1
     else:
-        print_colored(f"   ❌ FAILED - {result}", 'RED')
+        emit(f"   ❌ FAILED - {result}", 'RED')
         tests_failed += 1
-        print_colored("\n⚠️  Backend is not running! Please start it first.", 'RED')
-        print_colored("   Run: python -m app.main", 'YELLOW')
+        emit("\n⚠️  Backend is not running! Please start it first.", 'RED')
+        emit("   Run: python -m app.main", 'YELLOW')
         return
     
     # Get auth token first
-    print_colored("\n2. Testing Authentication (POST /auth/login)", 'BLUE')
-    auth_data = {
-        "device_id": "test-device-001",
-        "device_name": "Integration Test Device"
-    }
-    success, result = test_endpoint('POST', '/auth/login', data=auth_data)
+    token_key = f"{BASE_URL} {AUTH_DATA['user_id']}"
+    token = None if '--login' in sys.argv else load_cached_token(token_key)
     
-    if success:
-        token = result.get('access_token')
-        print_colored(f"   ✅ PASSED - Token received", 'GREEN')
-        tests_passed += 1
+    if token:
+        emit("\n2. Skipping Authentication - reusing cached token (run with --login to test it)", 'YELLOW')
         headers = {"Authorization": f"Bearer {token}"}
     else:
-        print_colored(f"   ❌ FAILED - {result}", 'RED')
-        tests_failed += 1
-        headers = {}
-    
-    # Test 3: Performance - Memory Status
-    print_colored("\n3. Testing Performance API (GET /performance/memory)", 'BLUE')
-    success, result = test_endpoint('GET', '/performance/memory', headers=headers)
-    if success:
-        print_colored(f"   ✅ PASSED", 'GREEN')
-        tests_passed += 1
-    else:
-        print_colored(f"   ❌ FAILED - {result}", 'RED')
-        tests_failed += 1
-    
-    # Test 4: Network Usage
-    print_colored("\n4. Testing Network API (GET /network-tools/usage)", 'BLUE')
-    success, result = test_endpoint('GET', '/network-tools/usage', headers=headers)
-    if success:
-        print_colored(f"   ✅ PASSED", 'GREEN')
-        tests_passed += 1
-    else:
-        print_colored(f"   ❌ FAILED - {result}", 'RED')
-        tests_failed += 1
-    
-    # Test 5: Security Overview
-    print_colored("\n5. Testing Security API (GET /security-tools/overview)", 'BLUE')
-    success, result = test_endpoint('GET', '/security-tools/overview', headers=headers)
-    if success:
-        print_colored(f"   ✅ PASSED", 'GREEN')
-        tests_passed += 1
-    else:
-        print_colored(f"   ❌ FAILED - {result}", 'RED')
-        tests_failed += 1
-    
-    # Test 6: Storage Overview
-    print_colored("\n6. Testing Storage API (GET /storage/storage-overview)", 'BLUE')
-    success, result = test_endpoint('GET', '/storage/storage-overview', headers=headers)
-    if success:
-        print_colored(f"   ✅ PASSED", 'GREEN')
-        tests_passed += 1
-    else:
-        print_colored(f"   ❌ FAILED - {result}", 'RED')
-        tests_failed += 1
-    
-    # Test 7: Anomaly Detection
-    print_colored("\n7. Testing Anomaly Detection (POST /anomaly/behavior)", 'BLUE')
-    anomaly_data = {
-        "features": [0.5, 0.3, 0.8, 0.2, 0.6, 0.4, 0.7, 0.1, 0.9, 0.3]
-    }
-    success, result = test_endpoint('POST', '/anomaly/behavior', data=anomaly_data, headers=headers)
-    if success:
-        print_colored(f"   ✅ PASSED - Anomaly score: {result.get('anomaly_score', 'N/A')}", 'GREEN')
-        tests_passed += 1
-    else:
-        print_colored(f"   ❌ FAILED - {result}", 'RED')
-        tests_failed += 1
-    
-    # Test 8: Models Info
-    print_colored("\n8. Testing Models API (GET /models/)", 'BLUE')
-    success, result = test_endpoint('GET', '/models/', headers=headers)
-    if success:
-        print_colored(f"   ✅ PASSED", 'GREEN')
-        tests_passed += 1
-    else:
-        print_colored(f"   ❌ FAILED - {result}", 'RED')
-        tests_failed += 1
+        emit("\n2. Testing Authentication (POST /auth/login)", 'BLUE')
+        success, result = await check_endpoint(client, 'POST', '/auth/login', data=AUTH_DATA)
+        
+        if success:
+            token = result.get('access_token')
+            emit(f"   ✅ PASSED - Token received", 'GREEN')
+            tests_passed += 1
+            headers = {"Authorization": f"Bearer {token}"}
+            save_cached_token(token_key, token)
+        else:
+            emit(f"   ❌ FAILED - {result}", 'RED')
+            tests_failed += 1
+            headers = {}
+    
+    # Show progress so far while the remaining checks run
+    flush_output()
+    
+    # The remaining tests only depend on the token, so run them concurrently and report in order
+    results = await asyncio.gather(*(
+        check_endpoint(client, method, endpoint, data=data, headers=headers)
+        for _, method, endpoint, data, _ in TESTS
+    ))
+    
+    for number, ((label, method, endpoint, _, detail), (success, result)) in enumerate(zip(TESTS, results), start=3):
+        emit(f"\n{number}. Testing {label} ({method} {endpoint})", 'BLUE')
+        if success:
+            suffix = f" - {detail[0]}: {result.get(detail[1], 'N/A')}" if detail else ""
+            emit(f"   ✅ PASSED{suffix}", 'GREEN')
+            tests_passed += 1
+        else:
+            emit(f"   ❌ FAILED - {result}", 'RED')
+            tests_failed += 1
     
     # Summary
     total_tests = tests_passed + tests_failed
     pass_rate = (tests_passed / total_tests * 100) if total_tests > 0 else 0
     
-    print_colored("\n" + "="*60, 'BLUE')
-    print_colored("  Test Summary", 'BLUE')
-    print_colored("="*60, 'BLUE')
-    print_colored(f"  Total Tests: {total_tests}", 'YELLOW')
-    print_colored(f"  Passed: {tests_passed}", 'GREEN')
-    print_colored(f"  Failed: {tests_failed}", 'RED')
-    print_colored(f"  Pass Rate: {pass_rate:.1f}%", 'YELLOW')
-    print_colored("="*60 + "\n", 'BLUE')
+    emit("\n" + "="*60, 'BLUE')
+    emit("  Test Summary", 'BLUE')
+    emit("="*60, 'BLUE')
+    emit(f"  Total Tests: {total_tests}", 'YELLOW')
+    emit(f"  Passed: {tests_passed}", 'GREEN')
+    emit(f"  Failed: {tests_failed}", 'RED')
+    emit(f"  Pass Rate: {pass_rate:.1f}%", 'YELLOW')
+    emit("="*60 + "\n", 'BLUE')
     
     if tests_failed == 0:
-        print_colored("🎉 All tests passed! Backend is ready for mobile app integration.", 'GREEN')
+        emit("🎉 All tests passed! Backend is ready for mobile app integration.", 'GREEN')
     else:
-        print_colored("⚠️  Some tests failed. Please check the backend logs.", 'YELLOW')
+        emit("⚠️  Some tests failed. Please check the backend logs.", 'YELLOW')
     
     return tests_failed == 0
 
+if pytest is not None:
+    @pytest.fixture(scope="session")
+    def session():
+        """One keep-alive client per pytest worker, shared by all its tests"""
+        with httpx.Client(base_url=BASE_URL, timeout=5) as client:
+            try:
+                client.get('/')
+            except httpx.ConnectError:
+                pytest.skip("Backend is not running - start it with: python -m app.main")
+            yield client
+
+    @pytest.fixture(scope="session")
+    def auth_headers(session):
+        """Log in once per worker (or reuse the cached token)"""
+        token_key = f"{BASE_URL} {AUTH_DATA['user_id']}"
+        token = load_cached_token(token_key)
+        if not token:
+            response = session.post('/auth/login', json=AUTH_DATA)
+            assert response.status_code == 200, f"Login: expected 200, got {response.status_code}"
+            token = orjson.loads(response.content)['access_token']
+            save_cached_token(token_key, token)
+        return {"Authorization": f"Bearer {token}"}
+
+    def test_health(session):
+        assert session.get('/').status_code == 200
+
+    @pytest.mark.parametrize("spec", TESTS, ids=lambda spec: spec[0])
+    def test_endpoint(spec, session, auth_headers):
+        label, method, endpoint, data, detail = spec
+        response = session.request(method, endpoint, json=data, headers=auth_headers)
+        assert response.status_code == 200, f"{label}: expected 200, got {response.status_code}"
+        if detail:
+            assert detail[1] in orjson.loads(response.content)
+
 if __name__ == "__main__":
-    import sys
-    success = main()
+    success = asyncio.run(main())
     sys.exit(0 if success else 1)